@@ -3,90 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from time import perf_counter
 from typing import Dict, Optional
 
 import cv2
 import numpy as np
 
-from .fallback import match_template, recognize_card_template, recognize_digits_ocr
+from .fallback import match_template, recognize_card_template, recognize_digits_ocr, to_grayscale
 from .models import ModelManager
-from vision.vision_types import (
-  AmountRecognition,
-  CardRecognition,
-  DealerButtonDetection,
-  ExtractedElements,
-  ExtractedRegion,
-  LayoutPack,
-  ROI
-)
+from vision.extraction import compile_layout, extract_all_rois, extract_roi
+from vision.vision_types import AmountRecognition, CardRecognition, DealerButtonDetection
 
-
-def _resolve_roi(frame: np.ndarray, roi: ROI) -> tuple[int, int, int, int]:
-  height, width = frame.shape[:2]
-  if roi.get("relative"):
-    x = int(round(roi["x"] * width))
-    y = int(round(roi["y"] * height))
-    w = int(round(roi["width"] * width))
-    h = int(round(roi["height"] * height))
-  else:
-    x = int(round(roi["x"]))
-    y = int(round(roi["y"]))
-    w = int(round(roi["width"]))
-    h = int(round(roi["height"]))
-
-  x = max(0, min(x, width))
-  y = max(0, min(y, height))
-  w = max(1, min(w, width - x))
-  h = max(1, min(h, height - y))
-  return x, y, w, h
-
-
-def extract_roi(frame: np.ndarray, roi: ROI) -> np.ndarray:
-  """Extract a sub-region from the frame using ROI coordinates."""
-
-  x, y, w, h = _resolve_roi(frame, roi)
-  return frame[y : y + h, x : x + w].copy()
-
-
-def extract_all_rois(frame: np.ndarray, layout: LayoutPack) -> ExtractedElements:
-  """Extract all ROIs defined in the layout pack from the frame."""
-
-  extracted: ExtractedElements = {}
-
-  def record(region_name: str, roi: ROI) -> ExtractedRegion:
-    start = perf_counter()
-    image = extract_roi(frame, roi)
-    latency = perf_counter() - start
-    return {"image": image, "roi": roi, "latency": latency}
-
-  cards = [record(f"card_{idx}", roi) for idx, roi in enumerate(layout.get("cardROIs", []))]
-  if cards:
-    extracted["cards"] = cards
-
-  stacks: Dict[str, ExtractedRegion] = {}
-  for position, roi in layout.get("stackROIs", {}).items():
-    stacks[position] = record(f"stack_{position}", roi)
-  if stacks:
-    extracted["stacks"] = stacks
-
-  if "potROI" in layout:
-    extracted["pot"] = record("pot", layout["potROI"])
-
-  if "buttonROI" in layout:
-    extracted["button"] = record("button", layout["buttonROI"])
-
-  if "actionButtonROIs" in layout:
-    action_button_regions: Dict[str, ExtractedRegion] = {}
-    for name, roi in layout["actionButtonROIs"].items():
-      action_button_regions[name] = record(f"action_{name}", roi)
-    if action_button_regions:
-      extracted["actionButtons"] = action_button_regions
-
-  if "turnIndicatorROI" in layout:
-    extracted["turnIndicator"] = record("turn_indicator", layout["turnIndicatorROI"])
-
-  return extracted
+# ROI extraction is shared with vision.extraction; only the recognizer differs.
+__all__ = ["ElementRecognizer", "compile_layout", "extract_all_rois", "extract_roi"]
 
 
 class ElementRecognizer:
@@ -151,10 +79,10 @@ class ElementRecognizer:
     return {"amount": result.amount, "confidence": result.confidence}
 
   def detect_dealer_button(self, image: np.ndarray) -> Dict[str, float]:
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
-    normalized = gray.astype(np.float32) / 255.0
-    variance = float(np.var(normalized))
-    mean = float(np.mean(normalized))
+    gray = to_grayscale(image)
+    mean_px, std_px = cv2.meanStdDev(gray)
+    mean = float(mean_px[0, 0]) / 255.0
+    variance = (float(std_px[0, 0]) / 255.0) ** 2
     confidence = min(1.0, variance * 2.5 + mean * 0.2)
 
     if self._dealer_button_template is not None:
@@ -4,14 +4,34 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from time import perf_counter, time
+from time import perf_counter_ns, time_ns
+
+from vision.gating import clamp_unit
+
+
+_NS_PER_SECOND = 1_000_000_000
 
 
 class VisionOutputBuilder:
   """Incrementally build a VisionOutput-compatible dictionary."""
 
+  __slots__ = (
+    "_timestamp",
+    "_cards",
+    "_stacks",
+    "_pot",
+    "_buttons",
+    "_positions_confidence",
+    "_occlusion",
+    "_action_buttons",
+    "_turn_state",
+    "_latency",
+    "_capture_start",
+    "_extraction_start"
+  )
+
   def __init__(self) -> None:
-    self._timestamp = int(time() * 1000)
+    self._timestamp = time_ns() // 1_000_000
     self._cards: Dict[str, object] = {
       "holeCards": [],
       "communityCards": [],
@@ -26,44 +46,46 @@ class VisionOutputBuilder:
     self._turn_state: Optional[Dict[str, object]] = None
     self._latency: Dict[str, float] = {"capture": 0.0, "extraction": 0.0, "total": 0.0}
 
-    self._capture_start = perf_counter()
-    self._extraction_start: Optional[float] = None
+    # Monotonic marks stay in integer nanoseconds; latencies are reported in seconds.
+    self._capture_start = perf_counter_ns()
+    self._extraction_start: Optional[int] = None
 
   def mark_capture_complete(self) -> None:
-    self._latency["capture"] = perf_counter() - self._capture_start
-    self._extraction_start = perf_counter()
+    now = perf_counter_ns()
+    self._latency["capture"] = (now - self._capture_start) / _NS_PER_SECOND
+    self._extraction_start = now
 
   def mark_extraction_complete(self) -> None:
     if self._extraction_start is None:
       self._latency["extraction"] = 0.0
     else:
-      self._latency["extraction"] = perf_counter() - self._extraction_start
+      self._latency["extraction"] = (perf_counter_ns() - self._extraction_start) / _NS_PER_SECOND
     self._latency["total"] = self._latency["capture"] + self._latency["extraction"]
 
   def set_cards(self, hole_cards: List[Dict[str, str]], community_cards: List[Dict[str, str]], confidence: float) -> None:
     self._cards = {
       "holeCards": hole_cards,
       "communityCards": community_cards,
-      "confidence": max(0.0, min(confidence, 1.0))
+      "confidence": clamp_unit(confidence)
     }
 
   def set_stack(self, position: str, amount: float, confidence: float) -> None:
     self._stacks[position] = {
       "amount": float(amount),
-      "confidence": max(0.0, min(confidence, 1.0))
+      "confidence": clamp_unit(confidence)
     }
 
   def set_pot(self, amount: float, confidence: float) -> None:
-    self._pot = {"amount": float(amount), "confidence": max(0.0, min(confidence, 1.0))}
+    self._pot = {"amount": float(amount), "confidence": clamp_unit(confidence)}
 
   def set_buttons(self, dealer: str, confidence: float) -> None:
-    self._buttons = {"dealer": dealer, "confidence": max(0.0, min(confidence, 1.0))}
+    self._buttons = {"dealer": dealer, "confidence": clamp_unit(confidence)}
 
   def set_positions(self, confidence: float) -> None:
-    self._positions_confidence = max(0.0, min(confidence, 1.0))
+    self._positions_confidence = clamp_unit(confidence)
 
   def set_occlusion(self, roi_name: str, occlusion_pct: float) -> None:
-    self._occlusion[roi_name] = max(0.0, min(occlusion_pct, 1.0))
+    self._occlusion[roi_name] = clamp_unit(occlusion_pct)
 
   def set_action_button(self, button_name: str, button_info: Dict[str, object]) -> None:
     self._action_buttons[button_name] = button_info
@@ -72,12 +94,18 @@ class VisionOutputBuilder:
     self._turn_state = {
       "isHeroTurn": is_hero_turn,
       "actionTimer": action_timer if action_timer is not None else 0,
-      "confidence": max(0.0, min(confidence, 1.0))
+      "confidence": clamp_unit(confidence)
     }
 
   def build(self) -> Dict[str, object]:
+    """Return the payload for the current frame.
+
+    Containers are shared with the builder, not copied; treat the payload as
+    read-only.
+    """
+
     if self._latency["total"] == 0.0:
-      elapsed = perf_counter() - self._capture_start
+      elapsed = (perf_counter_ns() - self._capture_start) / _NS_PER_SECOND
       if self._latency["extraction"] == 0.0:
         self._latency["extraction"] = max(0.0, elapsed - self._latency["capture"])
       self._latency["total"] = self._latency["capture"] + self._latency["extraction"]
@@ -4,7 +4,7 @@ from .capture import ScreenCapture, ScreenCaptureError
 from .confidence import aggregate_confidence, calculate_match_confidence
 from .extraction import ElementRecognizer, extract_all_rois, extract_roi
 from .gating import compute_overall_confidence, should_gate_element
-from .models import ModelManager
+from .models import ModelManager, get_model_manager
 from .occlusion import analyze_roi_variance, detect_occlusion, detect_popup_overlay
 from .output import VisionOutputBuilder
 from .server import VisionServicer, serve
@@ -22,6 +22,7 @@ __all__ = [
     "ScreenCapture",
     "ScreenCaptureError",
     "ModelManager",
+    "get_model_manager",
     "ElementRecognizer",
     "extract_roi",
     "extract_all_rois",
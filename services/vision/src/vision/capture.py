@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass, field
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import numpy as np
 
@@ -18,39 +19,54 @@ class ScreenCaptureError(RuntimeError):
 
 @dataclass(slots=True)
 class ScreenCapture:
-  """Provide cross-platform screen capture with graceful fallbacks."""
+  """Provide cross-platform screen capture with graceful fallbacks.
+
+  Frames are ``(height, width, 3)`` uint8 arrays in BGR channel order, the
+  OpenCV convention the rest of the pipeline assumes, whichever backend
+  produced them.
+  """
 
   window_title: Optional[str] = None
   fallback_resolution: Tuple[int, int] = (1080, 1920)
   _grabber: Optional[object] = field(init=False, default=None)
   _backend_name: Optional[str] = field(init=False, default=None)
+  _monitor: Optional[Dict[str, Any]] = field(init=False, default=None)
+  _grab_lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+  _fallback_frame: Optional[np.ndarray] = field(init=False, default=None)
 
   def __post_init__(self) -> None:
     self._detect_backend()
 
   def _detect_backend(self) -> None:
-    """Detect an available capture backend in priority order."""
-
-    try:
-      from PIL import ImageGrab  # type: ignore
+    """Detect an available capture backend in priority order.
 
-      self._grabber = ImageGrab
-      self._backend_name = "PIL.ImageGrab"
-      LOGGER.debug("Using PIL.ImageGrab for screen capture")
-      return
-    except Exception:  # pragma: no cover - optional dependency
-      LOGGER.debug("PIL.ImageGrab unavailable for screen capture")
+    mss comes first: its BGRA buffer is viewed as a BGR frame without a copy,
+    while PIL allocates an image and converts it before the array copy.
+    """
 
     try:
       import mss  # type: ignore  # pylint: disable=import-error
 
-      self._grabber = mss
+      # Keep one long-lived grabber; opening ``mss.mss()`` per frame rebuilds
+      # the display connection on every capture.
+      self._grabber = mss.mss()
+      self._monitor = self._grabber.monitors[0]
       self._backend_name = "mss"
       LOGGER.debug("Using mss for screen capture")
       return
     except Exception:  # pragma: no cover - optional dependency
       LOGGER.debug("mss unavailable for screen capture")
 
+    try:
+      from PIL import ImageGrab  # type: ignore
+
+      self._grabber = ImageGrab
+      self._backend_name = "PIL.ImageGrab"
+      LOGGER.debug("Using PIL.ImageGrab for screen capture")
+      return
+    except Exception:  # pragma: no cover - optional dependency
+      LOGGER.debug("PIL.ImageGrab unavailable for screen capture")
+
     self._grabber = None
     self._backend_name = None
 
@@ -58,28 +74,64 @@ class ScreenCapture:
     """Capture a frame from the screen or raise an error on failure.
 
     When no backend is available a black fallback frame is returned. This
-    enables downstream testing without native screen capture support.
+    enables downstream testing without native screen capture support. The
+    fallback frame is allocated once, shared across calls and read-only.
     """
 
     if self._grabber is None:
       LOGGER.warning("No screen capture backend available; returning fallback frame")
-      height, width = self.fallback_resolution
-      return np.zeros((height, width, 3), dtype=np.uint8)
+      return self._fallback()
 
     try:
-      if self._backend_name == "PIL.ImageGrab":
-        image = self._grabber.grab()  # type: ignore[attr-defined]
-        frame = np.array(image.convert("RGB"))
-      elif self._backend_name == "mss":
-        with self._grabber.mss() as sct:  # type: ignore[attr-defined]
-          monitor = sct.monitors[0]
-          raw = sct.grab(monitor)
-          frame = np.array(raw)[:, :, :3]
-      else:  # pragma: no cover - defensive fallback
+      grab = _GRAB_BACKENDS.get(self._backend_name or "")
+      if grab is None:  # pragma: no cover - defensive fallback
         raise ScreenCaptureError("Unsupported capture backend configured")
-
-      return frame
+      return grab(self)
     except Exception as exc:  # pragma: no cover - device interaction
       LOGGER.error("Screen capture failed: %s", exc)
+      return self._fallback()
+
+  def close(self) -> None:
+    """Release the backend's display resources; later captures use the fallback frame."""
+
+    with self._grab_lock:
+      grabber, self._grabber = self._grabber, None
+      self._backend_name = None
+    close = getattr(grabber, "close", None)
+    if callable(close):
+      close()
+    self._monitor = None
+
+  def _fallback(self) -> np.ndarray:
+    frame = self._fallback_frame
+    if frame is None or frame.shape[:2] != tuple(self.fallback_resolution):
       height, width = self.fallback_resolution
-      return np.zeros((height, width, 3), dtype=np.uint8)
+      frame = np.zeros((height, width, 3), dtype=np.uint8)
+      frame.setflags(write=False)
+      self._fallback_frame = frame
+    return frame
+
+
+def _grab_pil(capture: ScreenCapture) -> np.ndarray:
+  image = capture._grabber.grab()  # type: ignore[union-attr]
+  if image.mode not in ("RGB", "RGBA"):
+    image = image.convert("RGB")
+  # Drop alpha and reorder RGB to BGR through one channel view rather than a
+  # full-frame convert().
+  return np.asarray(image)[:, :, 2::-1]
+
+
+def _grab_mss(capture: ScreenCapture) -> np.ndarray:
+  # mss handles are not reentrant; serialize grabs across RPC threads.
+  with capture._grab_lock:
+    raw = capture._grabber.grab(capture._monitor)  # type: ignore[union-attr]
+  bgra = np.frombuffer(raw.raw, dtype=np.uint8).reshape(raw.height, raw.width, 4)
+  return bgra[:, :, :3]
+
+
+# Backend name -> frame grabber, so capture_frame dispatches with one lookup
+# instead of walking a backend if/elif chain every frame.
+_GRAB_BACKENDS: Dict[str, Callable[[ScreenCapture], np.ndarray]] = {
+  "PIL.ImageGrab": _grab_pil,
+  "mss": _grab_mss,
+}
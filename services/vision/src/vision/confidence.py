@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from math import exp, log
 from typing import Iterable
 
 import numpy as np
@@ -21,11 +20,14 @@ def calculate_match_confidence(prediction_probs: np.ndarray) -> float:
 def aggregate_confidence(confidences: Iterable[float]) -> float:
   """Aggregate confidences using a bounded geometric mean."""
 
-  values = [max(1e-6, min(float(conf), 1.0)) for conf in confidences if conf is not None]
-  if not values:
+  values = np.fromiter(
+    (conf for conf in confidences if conf is not None),
+    dtype=np.float64
+  )
+  values = values[~np.isnan(values)]
+  if values.size == 0:
     return 0.0
 
-  log_sum = sum(log(value) for value in values)
-  mean_log = log_sum / len(values)
-  score = exp(mean_log)
+  np.clip(values, 1e-6, 1.0, out=values)
+  score = float(np.exp(np.log(values).mean()))
   return max(0.0, min(score, 1.0))
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import asdict
 from time import perf_counter
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
-from .fallback import match_template, recognize_card_template, recognize_digits_ocr
+from .fallback import (
+  TemplateBank,
+  match_template,
+  prepare_templates,
+  recognize_card_template,
+  recognize_digits_cnn,
+  recognize_digits_ocr
+)
+from .hashing import LRUCache, roi_key
 from .models import ModelManager
 from .vision_types import (
   AmountRecognition,
@@ -22,6 +31,10 @@ from .vision_types import (
 )
 
 
+# Thousands separators and whitespace dropped from recognized amounts in one pass.
+_AMOUNT_STRIP = str.maketrans("", "", ", \t\n\r\f\v")
+
+
 def _resolve_roi(frame: np.ndarray, roi: ROI) -> tuple[int, int, int, int]:
   height, width = frame.shape[:2]
   if roi.get("relative"):
@@ -42,49 +55,103 @@ def _resolve_roi(frame: np.ndarray, roi: ROI) -> tuple[int, int, int, int]:
   return x, y, w, h
 
 
-def extract_roi(frame: np.ndarray, roi: ROI) -> np.ndarray:
-  """Extract a sub-region from the frame using ROI coordinates."""
+def extract_roi(frame: np.ndarray, roi: ROI, copy: bool = False) -> np.ndarray:
+  """Extract a sub-region from the frame using ROI coordinates.
+
+  The result is a view that aliases ``frame`` unless ``copy`` is set; pass
+  ``copy=True`` when the region must outlive or be modified independently of
+  the frame buffer.
+  """
 
   x, y, w, h = _resolve_roi(frame, roi)
-  return frame[y : y + h, x : x + w].copy()
+  region = frame[y : y + h, x : x + w]
+  return region.copy() if copy else region
 
 
-def extract_all_rois(frame: np.ndarray, layout: LayoutPack) -> ExtractedElements:
-  """Extract all ROIs defined in the layout pack from the frame."""
+def _resolve_rois(frame_shape: Tuple[int, ...], rois: Sequence[ROI]) -> np.ndarray:
+  """Vectorized :func:`_resolve_roi`: return an ``(N, 4)`` array of ``x, y, w, h``."""
 
-  extracted: ExtractedElements = {}
+  height, width = frame_shape[:2]
+  coords = np.array(
+    [(roi["x"], roi["y"], roi["width"], roi["height"]) for roi in rois], dtype=np.float64
+  ).reshape(-1, 4)
+  relative = np.fromiter((bool(roi.get("relative")) for roi in rois), dtype=bool, count=len(rois))
+  coords[relative] *= (width, height, width, height)
 
-  def record(region_name: str, roi: ROI) -> ExtractedRegion:
-    start = perf_counter()
-    image = extract_roi(frame, roi)
-    latency = perf_counter() - start
-    return {"image": image, "roi": roi, "latency": latency}
+  rects = np.round(coords).astype(np.int64)
+  np.clip(rects[:, 0], 0, width, out=rects[:, 0])
+  np.clip(rects[:, 1], 0, height, out=rects[:, 1])
+  np.clip(rects[:, 2], None, width - rects[:, 0], out=rects[:, 2])
+  np.clip(rects[:, 3], None, height - rects[:, 1], out=rects[:, 3])
+  np.maximum(rects[:, 2:], 1, out=rects[:, 2:])
+  return rects
 
-  cards = [record(f"card_{idx}", roi) for idx, roi in enumerate(layout.get("cardROIs", []))]
-  if cards:
-    extracted["cards"] = cards
 
-  stacks: Dict[str, ExtractedRegion] = {}
-  for position, roi in layout.get("stackROIs", {}).items():
-    stacks[position] = record(f"stack_{position}", roi)
-  if stacks:
-    extracted["stacks"] = stacks
+# (section, key, roi, y0, y1, x0, x1); key is None for list or single-region sections.
+LayoutSlices = List[Tuple[str, Optional[str], ROI, int, int, int, int]]
 
-  if "potROI" in layout:
-    extracted["pot"] = record("pot", layout["potROI"])
 
-  if "buttonROI" in layout:
-    extracted["button"] = record("button", layout["buttonROI"])
+def compile_layout(layout: LayoutPack, frame_shape: Tuple[int, ...]) -> LayoutSlices:
+  """Resolve every ROI in ``layout`` to pixel slice bounds for ``frame_shape``.
 
-  if "actionButtonROIs" in layout:
-    action_button_regions: Dict[str, ExtractedRegion] = {}
-    for name, roi in layout["actionButtonROIs"].items():
-      action_button_regions[name] = record(f"action_{name}", roi)
-    if action_button_regions:
-      extracted["actionButtons"] = action_button_regions
+  The result depends only on the layout and the frame size, so callers that
+  see the same layout every frame can compile once and pass it to
+  :func:`extract_all_rois`.
+  """
 
+  entries: List[Tuple[str, Optional[str], ROI]] = [("cards", None, roi) for roi in layout.get("cardROIs", [])]
+  entries.extend(("stacks", position, roi) for position, roi in layout.get("stackROIs", {}).items())
+  if "potROI" in layout:
+    entries.append(("pot", None, layout["potROI"]))
+  if "buttonROI" in layout:
+    entries.append(("button", None, layout["buttonROI"]))
+  if "actionButtonROIs" in layout:
+    entries.extend(("actionButtons", name, roi) for name, roi in layout["actionButtonROIs"].items())
   if "turnIndicatorROI" in layout:
-    extracted["turnIndicator"] = record("turn_indicator", layout["turnIndicatorROI"])
+    entries.append(("turnIndicator", None, layout["turnIndicatorROI"]))
+  if not entries:
+    return []
+
+  rects = _resolve_rois(frame_shape, [roi for _, _, roi in entries])
+  return [
+    (section, key, roi, y, y + h, x, x + w)
+    for (section, key, roi), (x, y, w, h) in zip(entries, rects.tolist())
+  ]
+
+
+def extract_all_rois(
+  frame: np.ndarray,
+  layout: LayoutPack,
+  compiled: Optional[LayoutSlices] = None,
+  record_timing: bool = False
+) -> ExtractedElements:
+  """Extract all ROIs defined in the layout pack from the frame.
+
+  ``compiled`` is the :func:`compile_layout` result for this layout and frame
+  size; when omitted, the layout is resolved for this frame. Per-region
+  ``latency`` is only measured when ``record_timing`` is set and is ``0.0``
+  otherwise.
+  """
+
+  if compiled is None:
+    compiled = compile_layout(layout, frame.shape)
+
+  extracted: ExtractedElements = {}
+  for section, key, roi, y0, y1, x0, x1 in compiled:
+    if record_timing:
+      start = perf_counter()
+      image = frame[y0:y1, x0:x1]
+      latency = perf_counter() - start
+    else:
+      image = frame[y0:y1, x0:x1]
+      latency = 0.0
+    region: ExtractedRegion = {"image": image, "roi": roi, "latency": latency}
+    if section == "cards":
+      extracted.setdefault("cards", []).append(region)  # type: ignore[union-attr]
+    elif key is not None:
+      extracted.setdefault(section, {})[key] = region  # type: ignore[misc, index]
+    else:
+      extracted[section] = region  # type: ignore[literal-required]
 
   return extracted
 
@@ -97,34 +164,122 @@ class ElementRecognizer:
     model_manager: ModelManager,
     use_fallback: bool = True,
     card_templates: Optional[Dict[str, np.ndarray]] = None,
-    dealer_button_template: Optional[np.ndarray] = None
+    dealer_button_template: Optional[np.ndarray] = None,
+    cache_size: int = 4096
   ) -> None:
     self._manager = model_manager
     self._use_fallback = use_fallback
-    self._card_templates = card_templates or {}
-    self._dealer_button_template = dealer_button_template
+    self._card_templates = TemplateBank(card_templates or {})
+    self._dealer_button_template = (
+      prepare_templates({"button": dealer_button_template})["button"] if dealer_button_template is not None else None
+    )
+    # Table elements rarely change between frames; results are reused for ROIs
+    # whose pixels exactly match a recent recognition.
+    self._card_cache: LRUCache[CardRecognition] = LRUCache(cache_size)
+    self._amount_cache: LRUCache[AmountRecognition] = LRUCache(cache_size)
+    self._scratch = threading.local()
+
+  def _gray(self, image: np.ndarray) -> np.ndarray:
+    """Grayscale ``image`` into a per-thread scratch buffer keyed by ROI size.
+
+    The result is only valid until the next call on the same thread with an
+    ROI of the same size.
+    """
+
+    if image.ndim == 2:
+      return image
+    buffers = getattr(self._scratch, "gray", None)
+    if buffers is None:
+      buffers = self._scratch.gray = {}
+    shape = image.shape[:2]
+    buffer = buffers.get(shape)
+    if buffer is None:
+      buffer = buffers[shape] = np.empty(shape, dtype=np.uint8)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=buffer)
+
+  def clear_cache(self) -> None:
+    self._card_cache.clear()
+    self._amount_cache.clear()
 
   def recognize_card(self, image: np.ndarray) -> Dict[str, object]:
-    rank, rank_conf = self._manager.predict_card_rank(image)
-    suit, suit_conf = self._manager.predict_card_suit(image)
+    return self.recognize_cards([image])[0]
+
+  def recognize_cards(self, images: Sequence[np.ndarray]) -> List[Dict[str, object]]:
+    """Recognize several cards, batching the model calls across cache misses."""
+
+    results, keys, misses = self._lookup(self._card_cache, images)
+    if misses:
+      predictions = self._manager.predict_cards([images[index] for index in misses])
+      for index, (rank, rank_conf, suit, suit_conf) in zip(misses, predictions):
+        result = self._finalize_card(images[index], rank, rank_conf, suit, suit_conf)
+        self._store(self._card_cache, keys[index], result)
+        results[index] = result
+    return [asdict(result) for result in results]
+
+  @staticmethod
+  def _lookup(
+    cache: LRUCache, images: Sequence[np.ndarray]
+  ) -> Tuple[List[Optional[object]], List[Optional[tuple]], List[int]]:
+    results: List[Optional[object]] = [None] * len(images)
+    keys: List[Optional[tuple]] = [None] * len(images)
+    misses: List[int] = []
+    for index, image in enumerate(images):
+      if cache.enabled and image.size:
+        keys[index] = roi_key(image)
+        results[index] = cache.get(keys[index])
+      if results[index] is None:
+        misses.append(index)
+    return results, keys, misses
+
+  @staticmethod
+  def _store(cache: LRUCache, key: Optional[tuple], result: object) -> None:
+    if key is not None:
+      cache.put(key, result)
+
+  def _finalize_card(
+    self,
+    image: np.ndarray,
+    rank: str,
+    rank_conf: float,
+    suit: str,
+    suit_conf: float
+  ) -> CardRecognition:
     confidence = min(rank_conf, suit_conf)
     method: str = "onnx"
 
     if self._use_fallback and confidence < 0.8:
-      fallback_rank, fallback_suit, fallback_conf = recognize_card_template(image, self._card_templates)
+      fallback_rank, fallback_suit, fallback_conf = recognize_card_template(self._gray(image), self._card_templates)
       if fallback_conf > confidence:
         rank, suit, confidence = fallback_rank, fallback_suit, fallback_conf
         method = "template"
 
-    result = CardRecognition(rank=rank, suit=suit, confidence=confidence, method=method)
-    return asdict(result)
+    return CardRecognition(rank=rank, suit=suit, confidence=confidence, method=method)
 
   def _recognize_amount(self, image: np.ndarray) -> AmountRecognition:
-    digits, confidence = self._manager.predict_digits(image)
+    return self._recognize_amount_batch([image])[0]
+
+  def _recognize_amount_batch(self, images: Sequence[np.ndarray]) -> List[AmountRecognition]:
+    results, keys, misses = self._lookup(self._amount_cache, images)
+    if misses:
+      predictions = self._manager.predict_digits_batch([images[index] for index in misses])
+      for index, (digits, confidence) in zip(misses, predictions):
+        result = self._finalize_amount(images[index], digits, confidence)
+        self._store(self._amount_cache, keys[index], result)
+        results[index] = result
+    return results  # type: ignore[return-value]
+
+  def _finalize_amount(self, image: np.ndarray, digits: str, confidence: float) -> AmountRecognition:
     method: str = "onnx"
 
-    cleaned = digits.replace(",", "").strip()
-    cleaned = cleaned.replace(" ", "")
+    cleaned = digits.translate(_AMOUNT_STRIP)
+
+    if (not cleaned or confidence < 0.7) and self._use_fallback:
+      # Per-glyph classification is in-process; tesseract stays the last resort.
+      glyph_digits, glyph_conf = recognize_digits_cnn(image, self._manager)
+      glyph_digits = glyph_digits.translate(_AMOUNT_STRIP)
+      if glyph_digits and glyph_conf > confidence:
+        cleaned = glyph_digits
+        confidence = glyph_conf
 
     if (not cleaned or confidence < 0.7) and self._use_fallback:
       fallback_digits, fallback_conf = recognize_digits_ocr(image)
@@ -150,15 +305,21 @@ class ElementRecognizer:
     result = self._recognize_amount(image)
     return {"amount": result.amount, "confidence": result.confidence}
 
+  def recognize_amounts(self, images: Sequence[np.ndarray]) -> List[Dict[str, float]]:
+    """Recognize several stack/pot amounts, batching the digit model call."""
+
+    results = self._recognize_amount_batch(images)
+    return [{"amount": result.amount, "confidence": result.confidence} for result in results]
+
   def detect_dealer_button(self, image: np.ndarray) -> Dict[str, float]:
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
-    normalized = gray.astype(np.float32) / 255.0
-    variance = float(np.var(normalized))
-    mean = float(np.mean(normalized))
+    gray = self._gray(image)
+    mean_px, std_px = cv2.meanStdDev(gray)
+    mean = float(mean_px[0, 0]) / 255.0
+    variance = (float(std_px[0, 0]) / 255.0) ** 2
     confidence = min(1.0, variance * 2.5 + mean * 0.2)
 
     if self._dealer_button_template is not None:
-      template_conf = match_template(image, self._dealer_button_template)
+      template_conf = match_template(gray, self._dealer_button_template)
       confidence = max(confidence, template_conf)
 
     present = confidence >= 0.35
@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+import functools
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+from .confidence import aggregate_confidence
+
+if TYPE_CHECKING:
+  from .models import ModelManager
+
+
+def to_grayscale(image: np.ndarray) -> np.ndarray:
+  """Return ``image`` as single-channel grayscale, passing 2-D input through."""
 
-def _to_grayscale(image: np.ndarray) -> np.ndarray:
   if image.ndim == 2:
     return image
   return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -20,8 +31,8 @@ def match_template(image: np.ndarray, template: np.ndarray) -> float:
   if template.size == 0 or image.size == 0:
     return 0.0
 
-  image_gray = _to_grayscale(image)
-  template_gray = _to_grayscale(template)
+  image_gray = to_grayscale(image)
+  template_gray = to_grayscale(template)
 
   try:
     result = cv2.matchTemplate(image_gray, template_gray, cv2.TM_CCOEFF_NORMED)
@@ -41,37 +52,326 @@ def _split_card_key(card_key: str) -> Tuple[str, str]:
   return rank, suit
 
 
-def recognize_card_template(image: np.ndarray, templates: Dict[str, np.ndarray]) -> Tuple[str, str, float]:
-  """Match an image against known card templates."""
+def prepare_templates(templates: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+  """Grayscale templates once so matching never re-converts them per ROI."""
+
+  return {key: np.ascontiguousarray(to_grayscale(template)) for key, template in templates.items()}
+
+
+DEFAULT_EARLY_EXIT_CONFIDENCE = 0.95
+
+# Upper bound on (positions x template pixels) scored in one matrix product;
+# larger searches fall back to cv2.matchTemplate per template.
+MAX_BATCHED_MATCH_ELEMENTS = 1 << 21
+
+# Groups larger than this are ranked on a half-resolution pyramid level first
+# and only the best candidates are scored at full resolution.
+COARSE_TOP_K = 5
+MIN_COARSE_TEMPLATE_SIDE = 16
+
+FLAT_ROI_STDDEV = 1e-3
+
+
+def _stack_zero_mean(templates: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+  stack = np.stack(templates).reshape(len(templates), -1).astype(np.float32)
+  stack -= stack.mean(axis=1, keepdims=True)
+  return stack, np.sqrt(np.einsum("ij,ij->i", stack, stack, dtype=np.float64))
+
+
+def _score_windows(
+  image_gray: np.ndarray,
+  tables: Tuple[np.ndarray, np.ndarray],
+  shape: Tuple[int, int],
+  stack: np.ndarray,
+  norms: np.ndarray
+) -> np.ndarray:
+  """``TM_CCOEFF_NORMED`` maxima of each stacked zero-mean template."""
+
+  t_height, t_width = shape
+  # Templates are zero-mean, so the window mean drops out of the numerator.
+  windows = sliding_window_view(image_gray, shape).reshape(-1, t_height * t_width)
+  numerators = stack @ windows.astype(np.float32).T
+
+  def window_total(table: np.ndarray) -> np.ndarray:
+    return (
+      table[t_height:, t_width:] - table[:-t_height, t_width:]
+      - table[t_height:, :-t_width] + table[:-t_height, :-t_width]
+    ).ravel()
+
+  sums, squares = tables
+  totals = window_total(sums)
+  variances = np.maximum(window_total(squares) - totals * totals / (t_height * t_width), 0.0)
+  denominators = norms[:, None] * np.sqrt(variances)[None, :]
+  scores = np.divide(numerators, denominators, out=np.zeros_like(denominators), where=denominators > 1e-6)
+  return np.clip(scores.max(axis=1), 0.0, 1.0)
+
+
+@dataclass(slots=True)
+class _TemplateGroup:
+  shape: Tuple[int, int]
+  keys: List[str]
+  stack: np.ndarray
+  norms: np.ndarray
+  coarse_shape: Optional[Tuple[int, int]] = None
+  coarse_stack: Optional[np.ndarray] = None
+  coarse_norms: Optional[np.ndarray] = None
+
+
+class _SearchImage:
+  """Grayscale ROI plus lazily built integral tables and pyramid level."""
+
+  __slots__ = ("image", "_tables", "_coarse")
+
+  def __init__(self, image: np.ndarray) -> None:
+    self.image = image
+    self._tables: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    self._coarse: Optional[_SearchImage] = None
+
+  @property
+  def tables(self) -> Tuple[np.ndarray, np.ndarray]:
+    if self._tables is None:
+      self._tables = cv2.integral2(self.image, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    return self._tables
+
+  @property
+  def coarse(self) -> "_SearchImage":
+    if self._coarse is None:
+      self._coarse = _SearchImage(cv2.pyrDown(self.image))
+    return self._coarse
+
+  def fits(self, shape: Tuple[int, int]) -> bool:
+    return shape[0] <= self.image.shape[0] and shape[1] <= self.image.shape[1]
+
+
+class TemplateBank:
+  """Card templates grouped by shape for batched ``TM_CCOEFF_NORMED`` scoring.
+
+  Each group of same-sized templates is zero-meaned and stacked into one
+  matrix at load time. Scoring an ROI then takes a single matrix product per
+  group against the ROI's sliding windows, with window variances from one
+  integral image, instead of a ``cv2.matchTemplate`` call per template.
+  Large groups are first ranked on a ``cv2.pyrDown`` level so only the
+  ``COARSE_TOP_K`` best candidates are scored at full resolution.
+  """
+
+  def __init__(self, templates: Dict[str, np.ndarray]) -> None:
+    self.templates = prepare_templates(templates)
+    by_shape: Dict[Tuple[int, int], List[str]] = {}
+    for key, template in self.templates.items():
+      if template.size:
+        by_shape.setdefault(template.shape[:2], []).append(key)
+
+    self._groups: List[_TemplateGroup] = []
+    for shape, keys in by_shape.items():
+      group = _TemplateGroup(shape, keys, *_stack_zero_mean([self.templates[key] for key in keys]))
+      if len(keys) > COARSE_TOP_K and min(shape) >= MIN_COARSE_TEMPLATE_SIDE:
+        coarse = [cv2.pyrDown(self.templates[key]) for key in keys]
+        group.coarse_shape = coarse[0].shape[:2]
+        group.coarse_stack, group.coarse_norms = _stack_zero_mean(coarse)
+      self._groups.append(group)
+
+  def __len__(self) -> int:
+    return len(self.templates)
+
+  def best_match(self, image_gray: np.ndarray) -> Tuple[Optional[str], float]:
+    """Return the best-scoring template key and its confidence in [0, 1]."""
+
+    # TM_CCOEFF_NORMED is invariant to brightness and contrast, so template
+    # means cannot reject candidates; a flat ROI, though, scores 0 everywhere.
+    _, stddev = cv2.meanStdDev(image_gray)
+    if stddev[0, 0] < FLAT_ROI_STDDEV:
+      return None, 0.0
+
+    search = _SearchImage(image_gray)
+    best_key, best_conf = None, 0.0
+    for group in self._groups:
+      if not search.fits(group.shape):
+        continue
+      keys, scores = self._score_group(search, group)
+      index = int(scores.argmax())
+      if scores[index] > best_conf:
+        best_key, best_conf = keys[index], float(scores[index])
+    return best_key, best_conf
+
+  def _score_group(self, search: _SearchImage, group: _TemplateGroup) -> Tuple[List[str], np.ndarray]:
+    height, width = search.image.shape[:2]
+    positions = (height - group.shape[0] + 1) * (width - group.shape[1] + 1)
+    if positions * group.stack.shape[1] > MAX_BATCHED_MATCH_ELEMENTS:
+      return group.keys, np.array([match_template(search.image, self.templates[key]) for key in group.keys])
+
+    if group.coarse_stack is None or not search.coarse.fits(group.coarse_shape):
+      return group.keys, _score_windows(search.image, search.tables, group.shape, group.stack, group.norms)
+
+    coarse = search.coarse
+    coarse_scores = _score_windows(coarse.image, coarse.tables, group.coarse_shape, group.coarse_stack, group.coarse_norms)
+    candidates = np.argpartition(-coarse_scores, COARSE_TOP_K - 1)[:COARSE_TOP_K]
+    scores = _score_windows(search.image, search.tables, group.shape, group.stack[candidates], group.norms[candidates])
+    return [group.keys[index] for index in candidates], scores
+
+
+def recognize_card_template(
+  image: np.ndarray,
+  templates: "Dict[str, np.ndarray] | TemplateBank",
+  early_exit: float = DEFAULT_EARLY_EXIT_CONFIDENCE
+) -> Tuple[str, str, float]:
+  """Match an image against known card templates.
 
-  best_rank, best_suit, best_conf = "?", "?", 0.0
+  The ROI is grayscaled once for all templates; pass templates through
+  :func:`prepare_templates` to skip their per-call conversion as well, or
+  as a :class:`TemplateBank` to score them all in batched matrix products.
+  For plain mappings, matching stops at the first template scoring at least
+  ``early_exit``.
+  """
+
+  if not templates or image.size == 0:
+    return "?", "?", 0.0
+
+  image_gray = to_grayscale(image)
+  if isinstance(templates, TemplateBank):
+    best_key, best_conf = templates.best_match(image_gray)
+    if best_key is None:
+      return "?", "?", 0.0
+    best_rank, best_suit = _split_card_key(best_key)
+    return best_rank, best_suit, best_conf
+
+  height, width = image_gray.shape[:2]
+  best_key, best_conf = None, 0.0
   for key, template in templates.items():
-    confidence = match_template(image, template)
+    # Templates larger than the ROI cannot match; skip the failing cv2 call.
+    if template.shape[0] > height or template.shape[1] > width:
+      continue
+    confidence = match_template(image_gray, template)
     if confidence > best_conf:
-      best_conf = confidence
-      best_rank, best_suit = _split_card_key(key)
+      best_key, best_conf = key, confidence
+      if confidence >= early_exit:
+        break
 
+  if best_key is None:
+    return "?", "?", 0.0
+  best_rank, best_suit = _split_card_key(best_key)
   return best_rank, best_suit, best_conf
 
 
-def recognize_digits_ocr(image: np.ndarray) -> Tuple[str, float]:
-  """Recognize digits using OCR when models are unavailable."""
+# Connected components smaller than this are treated as noise; decimal points
+# are only a few pixels, so the bound stays small.
+MIN_GLYPH_AREA = 4
+GLYPH_MARGIN = 2
+
+
+def segment_digit_glyphs(image: np.ndarray) -> List[np.ndarray]:
+  """Split an amount ROI into per-glyph crops ordered left to right.
+
+  The ROI is Otsu-thresholded with the minority polarity taken as ink, and
+  each 8-connected component is cropped and padded with the ROI's background
+  colour to a square, so it resizes to the digit model's input undistorted.
+  """
+
+  if image.size == 0:
+    return []
+
+  gray = to_grayscale(image)
+  _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+  if cv2.countNonZero(binary) * 2 > binary.size:
+    binary = cv2.bitwise_not(binary)
+
+  count, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+  components = stats[1:count]
+  components = components[components[:, cv2.CC_STAT_AREA] >= MIN_GLYPH_AREA]
+  components = components[np.argsort(components[:, cv2.CC_STAT_LEFT], kind="stable")]
+
+  background = cv2.mean(image, mask=cv2.bitwise_not(binary))
+  glyphs: List[np.ndarray] = []
+  for left, top, width, height, _ in components.tolist():
+    crop = image[top : top + height, left : left + width]
+    side = max(width, height) + 2 * GLYPH_MARGIN
+    pad_x, pad_y = side - width, side - height
+    glyphs.append(cv2.copyMakeBorder(
+      crop, pad_y // 2, pad_y - pad_y // 2, pad_x // 2, pad_x - pad_x // 2, cv2.BORDER_CONSTANT, value=background
+    ))
+  return glyphs
+
+
+def recognize_digits_cnn(image: np.ndarray, model_manager: "ModelManager") -> Tuple[str, float]:
+  """Recognize an amount by classifying each segmented glyph with the digit model.
+
+  All glyphs go through :meth:`ModelManager.predict_digits_batch` in one run.
+  """
+
+  glyphs = segment_digit_glyphs(image)
+  if not glyphs:
+    return "", 0.0
+
+  predictions = model_manager.predict_digits_batch(glyphs)
+  text = "".join(digits for digits, _ in predictions)
+  if not text:
+    return "", 0.0
+  return text, aggregate_confidence(confidence for _, confidence in predictions)
+
 
+OCR_DIGIT_WHITELIST = "0123456789.,$"
+_PYTESSERACT_CONFIG = f"--psm 7 --oem 1 -c tessedit_char_whitelist={OCR_DIGIT_WHITELIST}"
+
+_ocr_local = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pytesseract() -> Optional[Any]:
+  # Resolve once: a failing import re-scans sys.path on every attempt.
   try:
     import pytesseract  # type: ignore
-    from PIL import Image
   except Exception:  # pragma: no cover - optional dependency
+    return None
+  return pytesseract
+
+
+def _tesserocr_api() -> Optional[Any]:
+  """Return this thread's persistent tesseract handle, if tesserocr is installed.
+
+  ``PyTessBaseAPI`` keeps the engine loaded in-process, avoiding the
+  subprocess pytesseract spawns per call. Handles are not thread-safe, so
+  each worker thread owns one.
+  """
+
+  api = getattr(_ocr_local, "api", None)
+  if api is None:
+    try:
+      from tesserocr import OEM, PSM, PyTessBaseAPI  # type: ignore
+
+      api = PyTessBaseAPI(psm=PSM.SINGLE_LINE, oem=OEM.LSTM_ONLY)
+      api.SetVariable("tessedit_char_whitelist", OCR_DIGIT_WHITELIST)
+    except Exception:  # pragma: no cover - optional dependency
+      api = False
+    _ocr_local.api = api
+  return api or None
+
+
+def recognize_digits_ocr(image: np.ndarray) -> Tuple[str, float]:
+  """Recognize digits using OCR when models are unavailable.
+
+  Uses an in-process tesserocr engine when available and falls back to
+  pytesseract otherwise.
+  """
+
+  api = _tesserocr_api()
+  pytesseract = None if api is not None else _load_pytesseract()
+  if api is None and pytesseract is None:
     return "", 0.0
 
-  pil_image = Image.fromarray(image)
   try:
-    text = pytesseract.image_to_string(
-      pil_image,
-      config="--psm 7 --oem 1 -c tessedit_char_whitelist=0123456789.,$"
-    )
-  except pytesseract.TesseractError:  # pragma: no cover - runtime error
+    from PIL import Image
+  except Exception:  # pragma: no cover - optional dependency
     return "", 0.0
 
+  pil_image = Image.fromarray(image)
+  if api is not None:
+    api.SetImage(pil_image)
+    text = api.GetUTF8Text()
+  else:
+    try:
+      text = pytesseract.image_to_string(pil_image, config=_PYTESSERACT_CONFIG)
+    except pytesseract.TesseractError:  # pragma: no cover - runtime error
+      return "", 0.0
+
   cleaned = text.strip().replace("\n", "")
   cleaned = cleaned.replace(" ", "")
   cleaned = cleaned.replace("O", "0")
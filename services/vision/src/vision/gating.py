@@ -5,34 +5,47 @@ from __future__ import annotations
 from typing import Dict
 
 
+ELEMENT_WEIGHTS: Dict[str, float] = {
+  "cards": 0.5,
+  "stacks": 0.3,
+  "pot": 0.2,
+  "buttons": 0.1,
+  "positions": 0.1
+}
+DEFAULT_ELEMENT_WEIGHT = 0.05
+
+
 def should_gate_element(confidence: float, threshold: float) -> bool:
   """Return True when element confidence is below the threshold."""
 
   return confidence < threshold
 
 
+def clamp_unit(value: float) -> float:
+  """Clamp ``value`` to ``[0, 1]``; NaN maps to 0.0."""
+
+  # Chained comparison instead of max/min calls; NaN falls through to 0.0.
+  if 0.0 <= value <= 1.0:
+    return value
+  return 1.0 if value > 1.0 else 0.0
+
+
 def compute_overall_confidence(elements: Dict[str, float]) -> float:
   """Compute weighted confidence prioritizing critical elements."""
 
-  weights = {
-    "cards": 0.5,
-    "stacks": 0.3,
-    "pot": 0.2,
-    "buttons": 0.1,
-    "positions": 0.1
-  }
-
+  weight_for = ELEMENT_WEIGHTS.get
   weighted_sum = 0.0
   total_weight = 0.0
 
   for name, confidence in elements.items():
-    value = max(0.0, min(confidence, 1.0))
-    weight = weights.get(name, 0.05)
-    weighted_sum += value * weight
+    weight = weight_for(name, DEFAULT_ELEMENT_WEIGHT)
+    if 0.0 <= confidence <= 1.0:
+      weighted_sum += confidence * weight
+    elif confidence > 1.0:
+      weighted_sum += weight
     total_weight += weight
 
   if total_weight == 0:
     return 0.0
 
-  overall = weighted_sum / total_weight
-  return max(0.0, min(overall, 1.0))
+  return clamp_unit(weighted_sum / total_weight)
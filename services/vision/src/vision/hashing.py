@@ -0,0 +1,60 @@
+"""Content keys and small caches for recognizer results."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+import numpy as np
+
+
+V = TypeVar("V")
+
+
+def roi_key(image: np.ndarray) -> Tuple[Tuple[int, ...], str, bytes]:
+  """Cache key for an ROI image: its shape, dtype and a digest of its pixels.
+
+  The key is exact: amounts such as ``$0`` and ``$10`` differ in a handful of
+  pixels, which perceptual hashes routinely map to the same key.
+  """
+
+  digest = hashlib.blake2b(np.ascontiguousarray(image), digest_size=16).digest()
+  return image.shape, image.dtype.str, digest
+
+
+class LRUCache(Generic[V]):
+  """Bounded, thread-safe least-recently-used mapping."""
+
+  def __init__(self, max_entries: int) -> None:
+    self._max_entries = max(0, int(max_entries))
+    self._entries: "OrderedDict[Hashable, V]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  @property
+  def enabled(self) -> bool:
+    return self._max_entries > 0
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get(self, key: Hashable) -> Optional[V]:
+    with self._lock:
+      value = self._entries.get(key)
+      if value is not None:
+        self._entries.move_to_end(key)
+      return value
+
+  def put(self, key: Hashable, value: V) -> None:
+    if not self.enabled:
+      return
+    with self._lock:
+      self._entries[key] = value
+      self._entries.move_to_end(key)
+      while len(self._entries) > self._max_entries:
+        self._entries.popitem(last=False)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
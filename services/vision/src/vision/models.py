@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
-from typing import Dict, List, Optional, Tuple
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 
-from .confidence import aggregate_confidence, calculate_match_confidence
+from .confidence import aggregate_confidence
 
 try:
   import onnxruntime as ort
@@ -31,23 +34,140 @@ RANK_LABELS = ["2", "3", "4", "5", "6", "7", "8", "9", "T", "J", "Q", "K", "A"]
 SUIT_LABELS = ["h", "d", "c", "s"]
 DIGIT_LABELS = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."]
 
+INPUT_SIZE = 64
+_PIXEL_SCALE = np.float32(1.0 / 255.0)
+
+QUANTIZED_MODEL_SUFFIX = "_int8.onnx"
+OPTIMIZED_MODEL_SUFFIX = ".opt.onnx"
+CPU_PROVIDER = "CPUExecutionProvider"
+# Tried in order when VISION_ORT_PROVIDERS is unset; absent ones are skipped.
+ACCELERATED_PROVIDERS = (
+  "CUDAExecutionProvider",
+  "DmlExecutionProvider",
+  "CoreMLExecutionProvider",
+  "OpenVINOExecutionProvider",
+)
+
+# Each call is a handful of 64x64 images, so a single intra-op thread per
+# session beats fanning out; gRPC worker threads provide the parallelism.
+DEFAULT_INTRA_OP_THREADS = 1
+
+# ORT sizes its arena and settles kernel choices over the first runs of each
+# input shape. Preloading runs every batch size the servicer typically sends
+# (hole cards, board, both) a few times so those runs happen before serving.
+WARMUP_RUNS = 3
+WARMUP_BATCH_SIZES = (1, 2, 5, 7)
+
+
+def _optimized_model_path(path: str) -> str:
+  root, _ = os.path.splitext(path)
+  return root + OPTIMIZED_MODEL_SUFFIX
+
+
+def _env_threads(name: str, default: int) -> int:
+  value = os.environ.get(name)
+  if not value:
+    return default
+  try:
+    return max(1, int(value))
+  except ValueError:
+    LOGGER.warning("Ignoring invalid %s=%r", name, value)
+    return default
+
+
+def _env_flag(name: str, default: bool) -> bool:
+  value = os.environ.get(name)
+  if not value:
+    return default
+  return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+def _execution_providers() -> List[str]:
+  """Accelerated providers this build supports, CPU last.
+
+  ``VISION_ORT_PROVIDERS`` (comma separated, e.g. ``CUDAExecutionProvider``)
+  overrides the preference order; ``CPUExecutionProvider`` alone pins the
+  models to the CPU. IOBinding copies the host batch to the device and the
+  results back into the per-thread host buffers either way.
+  """
+
+  requested = [name.strip() for name in os.environ.get("VISION_ORT_PROVIDERS", "").split(",") if name.strip()]
+  available = set(ort.get_available_providers())
+  for name in requested:
+    if name not in available:
+      LOGGER.warning("Execution provider %s is not available; skipping", name)
+  preferred = requested or ACCELERATED_PROVIDERS
+  providers = [name for name in preferred if name in available and name != CPU_PROVIDER]
+  return providers + [CPU_PROVIDER]
+
+
+def _is_fresh(optimized_path: str, source_path: str) -> bool:
+  try:
+    return os.path.getmtime(optimized_path) >= os.path.getmtime(source_path)
+  except OSError:
+    return False
+
+
+@dataclass(slots=True)
+class _SessionIO:
+  """Input/output metadata of a session, read once instead of per run."""
+
+  input_name: str
+  batch_dim: object
+  output_name: str
+  # Non-batch dims of a float32 output, or None when ORT must allocate it.
+  output_dims: Optional[Tuple[int, ...]]
+
 
 class ModelManager:
-  """Manage ONNX models with optional warm-up."""
+  """Manage ONNX models with optional warm-up.
+
+  Sessions are shared read-only across RPC worker threads, since concurrent
+  ``run`` calls on one ORT session are safe; scratch buffers are kept per
+  thread. Lazy loads are serialized so racing threads build one session.
+  """
 
   def __init__(self, model_dir: str) -> None:
     self._model_dir = model_dir
     self._sessions: Dict[str, Optional["ort.InferenceSession"]] = {name: None for name in MODEL_FILES}
+    self._session_io: Dict[int, _SessionIO] = {}
+    self._local = threading.local()
+    self._load_lock = threading.Lock()
 
     if ort is None:
       LOGGER.warning("onnxruntime is not available; model inference will use fallbacks")
 
-  def preload_models(self) -> None:
-    """Load all known models into memory and warm them up."""
+  def load_models(self) -> None:
+    """Create every known session without warming it up.
+
+    Persists optimized graphs as a side effect, so a parent process can
+    prepare them once before spawning workers that load them.
+    """
 
     for name in MODEL_FILES:
       self._get_session(name)
 
+  def preload_models(self, batch_sizes: Sequence[int] = WARMUP_BATCH_SIZES) -> None:
+    """Load all known models into memory and warm them up.
+
+    Each model is run :data:`WARMUP_RUNS` times at every size in
+    ``batch_sizes``; fixed-batch models only at their own batch size.
+    """
+
+    for name in MODEL_FILES:
+      session = self._get_session(name)
+      if session is not None:
+        self._warm_up(session, batch_sizes)
+
+  def _warm_up(self, session: "ort.InferenceSession", batch_sizes: Sequence[int]) -> None:
+    batch_dim = self._io(session).batch_dim
+    sizes = (batch_dim,) if isinstance(batch_dim, int) else sorted(set(batch_sizes))
+    for count in sizes:
+      batch = np.zeros((count, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+      for _ in range(WARMUP_RUNS):
+        if self._run_batch(session, batch) is None:
+          return
+
   def _get_session(self, name: str) -> Optional["ort.InferenceSession"]:
     if ort is None:
       return None
@@ -56,24 +176,95 @@ class ModelManager:
     if session is not None:
       return session
 
-    filename = MODEL_FILES[name]
-    path = os.path.join(self._model_dir, filename)
-    if not os.path.exists(path):
-      LOGGER.warning("ONNX model missing: %s", path)
+    with self._load_lock:
+      # Another RPC thread may have finished loading while this one waited.
+      session = self._sessions.get(name)
+      if session is not None:
+        return session
+
+      paths = self._model_paths(name)
+      if not paths:
+        LOGGER.warning("ONNX model missing: %s", os.path.join(self._model_dir, MODEL_FILES[name]))
+        self._sessions[name] = None
+        return None
+
+      for path in paths:
+        try:
+          session = self._create_session(path)
+          dummy_input = self._dummy_input(session)
+          session.run(None, dummy_input)
+          self._sessions[name] = session
+          return session
+        except Exception as exc:  # pragma: no cover - runtime failure
+          LOGGER.error("Failed to load ONNX model %s: %s", path, exc)
+
       self._sessions[name] = None
       return None
 
+  def _model_paths(self, name: str) -> List[str]:
+    """Return existing model files in load order, INT8 variant first."""
+
+    filename = MODEL_FILES[name]
+    root, _ = os.path.splitext(filename)
+    candidates = (root + QUANTIZED_MODEL_SUFFIX, filename)
+    paths = [os.path.join(self._model_dir, candidate) for candidate in candidates]
+    return [path for path in paths if os.path.exists(path)]
+
+  def _create_session(self, path: str) -> "ort.InferenceSession":
+    """Create a session, reusing a previously optimized graph when current.
+
+    The first load serializes the optimized graph next to the source model so
+    later loads skip constant folding and node fusion. Extended optimizations
+    are used for the persisted graph because layout transforms from
+    ``ORT_ENABLE_ALL`` are specific to the host that produced them; those are
+    applied on top when the persisted graph is loaded. The graph is written to
+    a per-process temporary file and renamed into place, so a concurrent load
+    never sees a partly written file.
+    """
+
+    providers = _execution_providers()
+    if providers != [CPU_PROVIDER]:
+      # Graphs optimized for another device do not round-trip through a file.
+      options = self._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+      return ort.InferenceSession(path, sess_options=options, providers=providers)
+
+    optimized_path = _optimized_model_path(path)
+    if _is_fresh(optimized_path, path):
+      options = self._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+      return ort.InferenceSession(optimized_path, sess_options=options, providers=providers)
+
+    if not os.access(os.path.dirname(path) or ".", os.W_OK):
+      options = self._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+      return ort.InferenceSession(path, sess_options=options, providers=providers)
+
+    root, _ = os.path.splitext(path)
+    temp_path = f"{root}.{os.getpid()}.tmp{OPTIMIZED_MODEL_SUFFIX}"
+    options = self._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED)
+    options.optimized_model_filepath = temp_path
     try:
-      providers = ["CPUExecutionProvider"]
-      session = ort.InferenceSession(path, providers=providers)
-      dummy_input = self._dummy_input(session)
-      session.run(None, dummy_input)
-      self._sessions[name] = session
-      return session
-    except Exception as exc:  # pragma: no cover - runtime failure
-      LOGGER.error("Failed to load ONNX model %s: %s", path, exc)
-      self._sessions[name] = None
-      return None
+      session = ort.InferenceSession(path, sess_options=options, providers=providers)
+      if os.path.exists(temp_path):
+        os.replace(temp_path, optimized_path)
+    finally:
+      if os.path.exists(temp_path):
+        os.remove(temp_path)
+    return session
+
+  @staticmethod
+  def _session_options(level: "ort.GraphOptimizationLevel") -> "ort.SessionOptions":
+    """Session options sized for small CPU models run once per ROI."""
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = level
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = _env_threads("VISION_ORT_INTRA_OP_THREADS", DEFAULT_INTRA_OP_THREADS)
+    options.inter_op_num_threads = 1
+    # The arena grows on demand and keeps its peak; disabling it trades some
+    # allocation speed for a flat footprint under concurrent RPCs.
+    options.enable_cpu_mem_arena = _env_flag("VISION_ORT_CPU_ARENA", True)
+    options.enable_mem_pattern = True
+    options.add_session_config_entry("session.dynamic_block_base", "4")
+    return options
 
   def _dummy_input(self, session: "ort.InferenceSession") -> Dict[str, np.ndarray]:
     input_meta = session.get_inputs()[0]
@@ -81,25 +272,183 @@ class ModelManager:
     tensor = np.zeros(shape, dtype=np.float32)
     return {input_meta.name: tensor}
 
-  def _preprocess(self, image: np.ndarray) -> np.ndarray:
-    resized = cv2.resize(image, (64, 64), interpolation=cv2.INTER_AREA)
+  def _input_buffer(self) -> np.ndarray:
+    """Return this thread's reusable single-image NCHW input tensor."""
+
+    buffer = getattr(self._local, "input", None)
+    if buffer is None:
+      buffer = np.empty((1, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+      self._local.input = buffer
+    return buffer
+
+  @staticmethod
+  def _preprocess(image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Resize and scale ``image`` into a ``(1, 3, 64, 64)`` float32 tensor.
+
+    The HWC->CHW transpose and the 1/255 scaling are fused into one write to
+    ``out`` when given, so steady-state calls do not allocate.
+    """
+
+    resized = cv2.resize(image, (INPUT_SIZE, INPUT_SIZE), interpolation=cv2.INTER_AREA)
     if resized.ndim == 2:
       resized = cv2.cvtColor(resized, cv2.COLOR_GRAY2RGB)
-    normalized = resized.astype(np.float32) / 255.0
-    return normalized.transpose(2, 0, 1)[np.newaxis, :]
+    if out is None:
+      out = np.empty((1, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+    np.multiply(resized.transpose(2, 0, 1), _PIXEL_SCALE, out=out[0], dtype=np.float32)
+    return out
+
+  def _batch_buffer(self, count: int) -> np.ndarray:
+    """Return a ``(count, 3, 64, 64)`` view of this thread's batch tensor.
+
+    The backing array only grows, so steady-state frames with the same number
+    of ROIs bind the same memory to ORT every time.
+    """
+
+    buffer = getattr(self._local, "batch", None)
+    if buffer is None or len(buffer) < count:
+      buffer = np.empty((count, 3, INPUT_SIZE, INPUT_SIZE), dtype=np.float32)
+      self._local.batch = buffer
+    return buffer[:count]
+
+  def _io(self, session: "ort.InferenceSession") -> _SessionIO:
+    io = self._session_io.get(id(session))
+    if io is None:
+      input_meta = session.get_inputs()[0]
+      output_meta = session.get_outputs()[0]
+      input_shape = getattr(input_meta, "shape", None) or []
+      output_shape = getattr(output_meta, "shape", None)
+      output_dims = None
+      if getattr(output_meta, "type", None) == "tensor(float)" and output_shape:
+        dims = tuple(output_shape[1:])
+        if all(isinstance(dim, int) for dim in dims):
+          output_dims = dims
+      io = _SessionIO(input_meta.name, input_shape[0] if input_shape else None, output_meta.name, output_dims)
+      self._session_io[id(session)] = io
+    return io
+
+  def _output_buffer(self, session: "ort.InferenceSession", count: int) -> Optional[np.ndarray]:
+    """Return this thread's reusable float32 output tensor for ``count`` rows.
+
+    ``None`` when the output is not float32 or has symbolic non-batch
+    dimensions, in which case ORT allocates the output itself.
+    """
+
+    dims = self._io(session).output_dims
+    if dims is None:
+      return None
+
+    buffers = getattr(self._local, "outputs", None)
+    if buffers is None:
+      buffers = self._local.outputs = {}
+    buffer = buffers.get(id(session))
+    if buffer is None or len(buffer) < count or buffer.shape[1:] != dims:
+      buffer = buffers[id(session)] = np.empty((count, *dims), dtype=np.float32)
+    return buffer[:count]
+
+  def _binding(self, session: "ort.InferenceSession") -> "ort.IOBinding":
+    bindings = getattr(self._local, "bindings", None)
+    if bindings is None:
+      bindings = self._local.bindings = {}
+    binding = bindings.get(id(session))
+    if binding is None:
+      binding = bindings[id(session)] = session.io_binding()
+    return binding
+
+  def _infer(self, session: "ort.InferenceSession", tensor: np.ndarray) -> np.ndarray:
+    """Run ``session`` with the input and output bound in place via IOBinding.
+
+    The returned array is a per-thread buffer that the next run of the same
+    session overwrites; decode or copy it before running the session again.
+    """
+
+    io = self._io(session)
+    binding = self._binding(session)
+    binding.bind_cpu_input(io.input_name, tensor)
+    output = self._output_buffer(session, len(tensor))
+    if output is None:
+      binding.bind_output(io.output_name)
+      session.run_with_iobinding(binding)
+      return np.asarray(binding.copy_outputs_to_cpu()[0])
+
+    binding.bind_output(io.output_name, "cpu", 0, np.float32, list(output.shape), output.ctypes.data)
+    session.run_with_iobinding(binding)
+    return output
 
   def _run_model(self, session: Optional["ort.InferenceSession"], image: np.ndarray) -> Optional[np.ndarray]:
     if session is None:
       return None
     try:
-      input_name = session.get_inputs()[0].name
-      tensor = self._preprocess(image)
-      outputs = session.run(None, {input_name: tensor})
-      return np.asarray(outputs[0])
+      tensor = self._preprocess(image, self._input_buffer())
+      return self._infer(session, tensor)
     except Exception as exc:  # pragma: no cover - runtime failure
       LOGGER.error("Model inference failed: %s", exc)
       return None
 
+  def _run_batch(self, session: Optional["ort.InferenceSession"], batch: np.ndarray) -> Optional[np.ndarray]:
+    """Run a stacked NCHW batch, one image at a time for fixed-batch models."""
+
+    if session is None:
+      return None
+    try:
+      batch_dim = self._io(session).batch_dim
+      if isinstance(batch_dim, int) and batch_dim != len(batch):
+        outputs = [self._infer(session, batch[i : i + 1]).copy() for i in range(len(batch))]
+        return np.concatenate(outputs, axis=0)
+      return self._infer(session, batch)
+    except Exception as exc:  # pragma: no cover - runtime failure
+      LOGGER.error("Batched model inference failed: %s", exc)
+      return None
+
+  @staticmethod
+  def _decode_batch(prediction: Optional[np.ndarray], labels: Sequence[str], count: int) -> List[Tuple[str, float]]:
+    if prediction is None or prediction.size == 0 or prediction.size % count:
+      return [("?", 0.0)] * count
+
+    probs = prediction.reshape(count, -1)
+    if probs.shape[1] < 2:
+      return [("?", 0.0)] * count
+
+    # Same result as calculate_match_confidence per row, for the whole batch.
+    indices = probs.argmax(axis=1).tolist()
+    confidences = np.clip(np.nan_to_num(probs.max(axis=1), nan=0.0), 0.0, 1.0).tolist()
+    return [
+      (labels[index] if index < len(labels) else "?", confidence)
+      for index, confidence in zip(indices, confidences)
+    ]
+
+  def predict_cards(self, images: Sequence[np.ndarray]) -> List[Tuple[str, float, str, float]]:
+    """Predict rank and suit for several card images with one run per model.
+
+    Every image is preprocessed once and the stacked batch is shared by the
+    rank and suit models. Returns ``(rank, rank_conf, suit, suit_conf)`` per
+    image, in input order.
+    """
+
+    if not images:
+      return []
+
+    rank_session = self._get_session("card_rank")
+    suit_session = self._get_session("card_suit")
+    if rank_session is None and suit_session is None:
+      return [("?", 0.0, "?", 0.0)] * len(images)
+
+    batch = self._batch_buffer(len(images))
+    try:
+      for index, image in enumerate(images):
+        self._preprocess(image, batch[index : index + 1])
+    except Exception as exc:  # pragma: no cover - runtime failure
+      LOGGER.error("Card preprocessing failed: %s", exc)
+      return [("?", 0.0, "?", 0.0)] * len(images)
+
+    ranks = self._decode_batch(self._run_batch(rank_session, batch), RANK_LABELS, len(images))
+    suits = self._decode_batch(self._run_batch(suit_session, batch), SUIT_LABELS, len(images))
+    return [(rank, rank_conf, suit, suit_conf) for (rank, rank_conf), (suit, suit_conf) in zip(ranks, suits)]
+
+  def predict_card(self, image: np.ndarray) -> Tuple[str, float, str, float]:
+    """Predict rank and suit for one card, preprocessing the image once."""
+
+    return self.predict_cards([image])[0]
+
   def predict_card_rank(self, image: np.ndarray) -> Tuple[str, float]:
     session = self._get_session("card_rank")
     prediction = self._run_model(session, image)
@@ -110,10 +459,7 @@ class ModelManager:
     if probs.ndim == 0:
       return "?", 0.0
 
-    confidence = calculate_match_confidence(probs)
-    index = int(np.argmax(probs))
-    rank = RANK_LABELS[index] if 0 <= index < len(RANK_LABELS) else "?"
-    return rank, confidence
+    return self._top_label(probs, RANK_LABELS)
 
   def predict_card_suit(self, image: np.ndarray) -> Tuple[str, float]:
     session = self._get_session("card_suit")
@@ -125,32 +471,79 @@ class ModelManager:
     if probs.ndim == 0:
       return "?", 0.0
 
-    confidence = calculate_match_confidence(probs)
-    index = int(np.argmax(probs))
-    suit = SUIT_LABELS[index] if 0 <= index < len(SUIT_LABELS) else "?"
-    return suit, confidence
+    return self._top_label(probs, SUIT_LABELS)
 
   def predict_digits(self, image: np.ndarray) -> Tuple[str, float]:
     session = self._get_session("digit")
     prediction = self._run_model(session, image)
     if prediction is None:
       return "", 0.0
+    return self._decode_digits(prediction)
+
+  def predict_digits_batch(self, images: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+    """Predict digit strings for several amount images with one model run."""
+
+    if not images:
+      return []
+
+    session = self._get_session("digit")
+    if session is None:
+      return [("", 0.0)] * len(images)
+
+    batch = self._batch_buffer(len(images))
+    try:
+      for index, image in enumerate(images):
+        self._preprocess(image, batch[index : index + 1])
+    except Exception as exc:  # pragma: no cover - runtime failure
+      LOGGER.error("Digit preprocessing failed: %s", exc)
+      return [("", 0.0)] * len(images)
+
+    prediction = self._run_batch(session, batch)
+    if prediction is None or prediction.ndim == 0 or len(prediction) != len(images):
+      return [("", 0.0)] * len(images)
+    return [self._decode_digits(row) for row in prediction]
 
+  @staticmethod
+  def _top_label(probs: np.ndarray, labels: Sequence[str]) -> Tuple[str, float]:
+    """Best label and its probability from one argmax over ``probs``.
+
+    Same confidence as :func:`calculate_match_confidence`, read at the argmax
+    instead of from a second max reduction.
+    """
+
+    index = int(probs.argmax())
+    confidence = max(0.0, min(float(probs.flat[index]), 1.0))
+    return (labels[index] if index < len(labels) else "?"), confidence
+
+  @staticmethod
+  def _decode_digits(prediction: np.ndarray) -> Tuple[str, float]:
     probs = prediction.squeeze()
     if probs.ndim == 1:
-      index = int(np.argmax(probs))
-      confidence = calculate_match_confidence(probs)
-      return DIGIT_LABELS[index], confidence
+      return ModelManager._top_label(probs, DIGIT_LABELS)
 
     if probs.ndim == 2:
-      indices = np.argmax(probs, axis=1)
-      confidences: List[float] = []
-      tokens: List[str] = []
-      for row, idx in zip(probs, indices):
-        if 0 <= idx < len(DIGIT_LABELS):
-          tokens.append(DIGIT_LABELS[idx])
-          confidences.append(float(row[idx]))
-      confidence = aggregate_confidence(confidences) if confidences else 0.0
-      return "".join(tokens), confidence
+      # One argmax and one gather for every time step; rows whose best class
+      # has no label (e.g. a CTC blank) are dropped.
+      indices = probs.argmax(axis=1)
+      valid = indices < len(DIGIT_LABELS)
+      indices = indices[valid]
+      confidences = probs[valid][np.arange(len(indices)), indices]
+      text = "".join([DIGIT_LABELS[index] for index in indices.tolist()])
+      return text, aggregate_confidence(confidences) if confidences.size else 0.0
 
     return "", 0.0
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_model_manager(model_dir: str) -> ModelManager:
+  return ModelManager(model_dir)
+
+
+def get_model_manager(model_dir: str) -> ModelManager:
+  """Return the process-wide :class:`ModelManager` for ``model_dir``.
+
+  Sessions are thread-safe to run, so every servicer and worker thread in a
+  process can share one set of loaded, warmed-up models.
+  """
+
+  return _shared_model_manager(os.path.abspath(model_dir))
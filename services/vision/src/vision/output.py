@@ -4,66 +4,133 @@ from __future__ import annotations
 
 from typing import Dict, List, Optional
 
-from time import perf_counter, time
+from time import perf_counter_ns, time_ns
+
+from .gating import clamp_unit
+
+
+_NS_PER_SECOND = 1_000_000_000
+
+# Templates for the per-frame sections; reset() hands each builder copies.
+_EMPTY_CARDS: Dict[str, object] = {"hole_cards": [], "community_cards": [], "confidence": 0.0}
+_EMPTY_POT: Dict[str, float] = {"amount": 0.0, "confidence": 0.0}
+_EMPTY_BUTTONS: Dict[str, object] = {"dealer": "", "confidence": 0.0}
+_ZERO_LATENCY: Dict[str, float] = {"capture": 0.0, "extraction": 0.0, "total": 0.0}
 
 
 class VisionOutputBuilder:
-  """Incrementally build a VisionOutput-compatible dictionary."""
-
-  def __init__(self) -> None:
-    self._timestamp = int(time() * 1000)
-    self._cards: Dict[str, object] = {
-      "hole_cards": [],
-      "community_cards": [],
-      "confidence": 0.0
-    }
+  """Incrementally build a VisionOutput-compatible dictionary.
+
+  A builder can be reused across frames with :meth:`reset`. Each frame's
+  payload is independent of later frames unless ``reuse_output`` is set, in
+  which case :meth:`build` returns the same dict every frame and
+  :meth:`reset` clears its containers in place; only callers that consume
+  the payload before the next reset, like the servicer, should opt in.
+  """
+
+  __slots__ = (
+    "_timestamp",
+    "_cards",
+    "_stacks",
+    "_pot",
+    "_buttons",
+    "_positions_confidence",
+    "_occlusion",
+    "_action_buttons",
+    "_turn_state",
+    "_latency",
+    "_capture_start",
+    "_extraction_start",
+    "_positions",
+    "_output"
+  )
+
+  def __init__(self, reuse_output: bool = False) -> None:
     self._stacks: Dict[str, Dict[str, float]] = {}
-    self._pot: Dict[str, float] = {"amount": 0.0, "confidence": 0.0}
-    self._buttons: Dict[str, object] = {"dealer": "", "confidence": 0.0}
-    self._positions_confidence = 0.0
     self._occlusion: Dict[str, float] = {}
     self._action_buttons: Dict[str, Dict[str, object]] = {}
+    self._latency: Dict[str, float] = dict(_ZERO_LATENCY)
+    self._positions: Dict[str, float] = {"confidence": 0.0}
+    # With reuse the top-level payload keeps its schema across frames and
+    # build() only rebinds the per-frame values.
+    self._output: Optional[Dict[str, object]] = None
+    if reuse_output:
+      self._output = {
+        "timestamp": 0,
+        "cards": None,
+        "stacks": self._stacks,
+        "pot": None,
+        "buttons": None,
+        "positions": self._positions,
+        "occlusion": self._occlusion,
+        "latency": self._latency
+      }
+    self.reset()
+
+  def reset(self) -> None:
+    """Start a new frame.
+
+    With ``reuse_output``, payloads from an earlier :meth:`build` are cleared
+    too, so consume them before resetting.
+    """
+
+    self._timestamp = time_ns() // 1_000_000
+    self._cards: Dict[str, object] = {**_EMPTY_CARDS, "hole_cards": [], "community_cards": []}
+    self._pot: Dict[str, float] = _EMPTY_POT.copy()
+    self._buttons: Dict[str, object] = _EMPTY_BUTTONS.copy()
+    self._positions_confidence = 0.0
     self._turn_state: Optional[Dict[str, object]] = None
-    self._latency: Dict[str, float] = {"capture": 0.0, "extraction": 0.0, "total": 0.0}
+    if self._output is not None:
+      self._stacks.clear()
+      self._occlusion.clear()
+      self._action_buttons.clear()
+      self._latency.update(_ZERO_LATENCY)
+    else:
+      self._stacks = {}
+      self._occlusion = {}
+      self._action_buttons = {}
+      self._latency = dict(_ZERO_LATENCY)
 
-    self._capture_start = perf_counter()
-    self._extraction_start: Optional[float] = None
+    # Monotonic marks stay in integer nanoseconds; latencies are reported in seconds.
+    self._capture_start = perf_counter_ns()
+    self._extraction_start: Optional[int] = None
 
   def mark_capture_complete(self) -> None:
-    self._latency["capture"] = perf_counter() - self._capture_start
-    self._extraction_start = perf_counter()
+    now = perf_counter_ns()
+    self._latency["capture"] = (now - self._capture_start) / _NS_PER_SECOND
+    self._extraction_start = now
 
   def mark_extraction_complete(self) -> None:
     if self._extraction_start is None:
       self._latency["extraction"] = 0.0
     else:
-      self._latency["extraction"] = perf_counter() - self._extraction_start
+      self._latency["extraction"] = (perf_counter_ns() - self._extraction_start) / _NS_PER_SECOND
     self._latency["total"] = self._latency["capture"] + self._latency["extraction"]
 
   def set_cards(self, hole_cards: List[Dict[str, str]], community_cards: List[Dict[str, str]], confidence: float) -> None:
     self._cards = {
       "hole_cards": hole_cards,
       "community_cards": community_cards,
-      "confidence": max(0.0, min(confidence, 1.0))
+      "confidence": clamp_unit(confidence)
     }
 
   def set_stack(self, position: str, amount: float, confidence: float) -> None:
     self._stacks[position] = {
       "amount": float(amount),
-      "confidence": max(0.0, min(confidence, 1.0))
+      "confidence": clamp_unit(confidence)
     }
 
   def set_pot(self, amount: float, confidence: float) -> None:
-    self._pot = {"amount": float(amount), "confidence": max(0.0, min(confidence, 1.0))}
+    self._pot = {"amount": float(amount), "confidence": clamp_unit(confidence)}
 
   def set_buttons(self, dealer: str, confidence: float) -> None:
-    self._buttons = {"dealer": dealer, "confidence": max(0.0, min(confidence, 1.0))}
+    self._buttons = {"dealer": dealer, "confidence": clamp_unit(confidence)}
 
   def set_positions(self, confidence: float) -> None:
-    self._positions_confidence = max(0.0, min(confidence, 1.0))
+    self._positions_confidence = clamp_unit(confidence)
 
   def set_occlusion(self, roi_name: str, occlusion_pct: float) -> None:
-    self._occlusion[roi_name] = max(0.0, min(occlusion_pct, 1.0))
+    self._occlusion[roi_name] = clamp_unit(occlusion_pct)
 
   def set_action_button(self, button_name: str, button_info: Dict[str, object]) -> None:
     self._action_buttons[button_name] = button_info
@@ -72,31 +139,50 @@ class VisionOutputBuilder:
     self._turn_state = {
       "is_hero_turn": is_hero_turn,
       "action_timer": action_timer if action_timer is not None else 0,
-      "confidence": max(0.0, min(confidence, 1.0))
+      "confidence": clamp_unit(confidence)
     }
 
   def build(self) -> Dict[str, object]:
+    """Return the payload for the current frame.
+
+    With ``reuse_output`` the returned dict and its containers are reused
+    across frames, not copied; treat that payload as read-only and consume
+    it before the next :meth:`reset`.
+    """
+
     if self._latency["total"] == 0.0:
-      elapsed = perf_counter() - self._capture_start
+      elapsed = (perf_counter_ns() - self._capture_start) / _NS_PER_SECOND
       if self._latency["extraction"] == 0.0:
         self._latency["extraction"] = max(0.0, elapsed - self._latency["capture"])
       self._latency["total"] = self._latency["capture"] + self._latency["extraction"]
 
-    output: Dict[str, object] = {
-      "timestamp": self._timestamp,
-      "cards": self._cards,
-      "stacks": self._stacks,
-      "pot": self._pot,
-      "buttons": self._buttons,
-      "positions": {"confidence": self._positions_confidence},
-      "occlusion": self._occlusion,
-      "latency": self._latency
-    }
+    output = self._output
+    if output is None:
+      output = {
+        "timestamp": self._timestamp,
+        "cards": self._cards,
+        "stacks": self._stacks,
+        "pot": self._pot,
+        "buttons": self._buttons,
+        "positions": {"confidence": self._positions_confidence},
+        "occlusion": self._occlusion,
+        "latency": self._latency
+      }
+    else:
+      output["timestamp"] = self._timestamp
+      output["cards"] = self._cards
+      output["pot"] = self._pot
+      output["buttons"] = self._buttons
+      self._positions["confidence"] = self._positions_confidence
 
     if self._action_buttons:
       output["action_buttons"] = self._action_buttons
+    else:
+      output.pop("action_buttons", None)
 
     if self._turn_state is not None:
       output["turn_state"] = self._turn_state
+    else:
+      output.pop("turn_state", None)
 
     return output
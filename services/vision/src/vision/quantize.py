@@ -0,0 +1,132 @@
+"""Offline INT8 quantization for the vision ONNX models.
+
+Writes ``<name>_int8.onnx`` next to each FP32 model so :class:`ModelManager`
+picks the quantized variant up on the next load. Run with::
+
+  python -m vision.quantize /models [--calibration-dir /crops]
+
+With a directory of captured ROI crops the models are quantized statically
+(QDQ, INT8 weights and activations) from those crops; otherwise only the
+weights are quantized.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from .models import MODEL_FILES, QUANTIZED_MODEL_SUFFIX, ModelManager
+
+
+LOGGER = logging.getLogger(__name__)
+
+CALIBRATION_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def load_calibration_tensors(calibration_dir: str) -> List[np.ndarray]:
+  """Preprocess every image in ``calibration_dir`` like :class:`ModelManager` does."""
+
+  tensors: List[np.ndarray] = []
+  for entry in sorted(os.listdir(calibration_dir)):
+    if not entry.lower().endswith(CALIBRATION_EXTENSIONS):
+      continue
+    image = cv2.imread(os.path.join(calibration_dir, entry), cv2.IMREAD_COLOR)
+    if image is None:
+      LOGGER.warning("Skipping unreadable calibration image %s", entry)
+      continue
+    tensors.append(ModelManager._preprocess(image))
+  return tensors
+
+
+class _CalibrationReader:
+  """Feed preprocessed crops to ``quantize_static`` one image at a time."""
+
+  def __init__(self, input_name: str, tensors: Sequence[np.ndarray]) -> None:
+    self._input_name = input_name
+    self._tensors = tensors
+    self._iterator: Optional[Iterator[np.ndarray]] = None
+
+  def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+    if self._iterator is None:
+      self._iterator = iter(self._tensors)
+    tensor = next(self._iterator, None)
+    return None if tensor is None else {self._input_name: tensor}
+
+  def rewind(self) -> None:
+    self._iterator = None
+
+
+def quantize_models(
+  model_dir: str,
+  names: Optional[Sequence[str]] = None,
+  overwrite: bool = False,
+  calibration_dir: Optional[str] = None
+) -> List[str]:
+  """Quantize models to 8 bits and return the written paths.
+
+  Without ``calibration_dir`` only weights are quantized, stored as unsigned
+  8-bit: signed INT8 weights on ``Conv`` lower to ``ConvInteger`` with int8
+  inputs, which the CPU execution provider does not implement. With it,
+  weights and activations are quantized to signed INT8 in QDQ form using
+  ranges calibrated on the crops, which the CPU provider fuses into
+  ``QLinearConv``/``QLinearMatMul`` kernels.
+  """
+
+  try:
+    from onnxruntime import InferenceSession
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+  except Exception as exc:  # pragma: no cover - optional dependency
+    raise RuntimeError("onnxruntime.quantization (and the onnx package) is required to quantize models") from exc
+
+  tensors = load_calibration_tensors(calibration_dir) if calibration_dir else []
+  if calibration_dir and not tensors:
+    raise ValueError(f"No calibration images found in {calibration_dir}")
+
+  written: List[str] = []
+  for name in names or MODEL_FILES:
+    source = os.path.join(model_dir, MODEL_FILES[name])
+    root, _ = os.path.splitext(source)
+    target = root + QUANTIZED_MODEL_SUFFIX
+    if not os.path.exists(source):
+      LOGGER.warning("Skipping %s; model missing: %s", name, source)
+      continue
+    if os.path.exists(target) and not overwrite:
+      LOGGER.info("Keeping existing quantized model %s", target)
+      continue
+
+    if tensors:
+      input_name = InferenceSession(source, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+      quantize_static(
+        source,
+        target,
+        _CalibrationReader(input_name, tensors),
+        quant_format=QuantFormat.QDQ,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QInt8
+      )
+    else:
+      quantize_dynamic(source, target, weight_type=QuantType.QUInt8)
+    LOGGER.info("Quantized %s -> %s", source, target)
+    written.append(target)
+
+  return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("model_dir", nargs="?", default=os.environ.get("VISION_MODEL_DIR", "models"))
+  parser.add_argument("--overwrite", action="store_true", help="replace existing *_int8.onnx files")
+  parser.add_argument("--calibration-dir", help="captured ROI crops for static INT8 calibration")
+  args = parser.parse_args(argv)
+
+  logging.basicConfig(level=logging.INFO)
+  quantize_models(args.model_dir, overwrite=args.overwrite, calibration_dir=args.calibration_dir)
+
+
+if __name__ == "__main__":
+  main()
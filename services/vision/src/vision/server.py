@@ -2,22 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
+import multiprocessing
 import os
+import threading
 from concurrent import futures
-from statistics import fmean
-from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 import grpc
-
-if TYPE_CHECKING:
-    import numpy as np
+import numpy as np
 
 from .capture import ScreenCapture, ScreenCaptureError
-from .extraction import ElementRecognizer, extract_all_rois
-from .models import ModelManager
-from .occlusion import detect_occlusion
+from .extraction import ElementRecognizer, LayoutSlices, compile_layout, extract_all_rois
+from .hashing import LRUCache
+from .models import ModelManager, get_model_manager
+from .occlusion import detect_occlusion_batch
 from .output import VisionOutputBuilder
 from .templates import (
     TemplateLoadError,
@@ -31,6 +43,129 @@ from . import vision_pb2_grpc
 
 LOGGER = logging.getLogger(__name__)
 
+R = TypeVar("R")
+
+# Distinct table layouts kept parsed and compiled at once.
+LAYOUT_CACHE_SIZE = 8
+
+# Occlusion scores above this come from near-flat pixels (intensity std under
+# half of VARIANCE_THRESHOLD) with no glyph for the models to read, so card
+# and digit inference is skipped for them. The popup-overlay flag is not used
+# here because white card faces legitimately trip its near-white test.
+UNREADABLE_OCCLUSION_SCORE = 0.5
+_UNREADABLE_CARD: Mapping[str, object] = {"rank": "?", "suit": "?", "confidence": 0.0}
+_UNREADABLE_AMOUNT: Mapping[str, float] = {"amount": 0.0, "confidence": 0.0}
+
+
+_ACTION_BUTTON_FIELDS = frozenset(
+    vision_pb2.ActionButtons.DESCRIPTOR.fields_by_name
+)
+
+
+# Per-ROI memo and occlusion keys, formatted once per distinct layout rather
+# than once per ROI per frame.
+@functools.lru_cache(maxsize=16)
+def _card_names(count: int) -> Tuple[str, ...]:
+    return tuple(f"card_{index}" for index in range(count))
+
+
+@functools.lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _stack_names(positions: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(f"stack_{position}" for position in positions)
+
+
+def _region_images(elements: Mapping[str, object]) -> List[np.ndarray]:
+    """Every ROI crop of an extracted frame, in a stable order."""
+
+    regions: List[Mapping[str, object]] = list(elements.get("cards", []))
+    regions.extend(elements.get("stacks", {}).values())
+    regions.extend(elements.get("actionButtons", {}).values())
+    for key in ("pot", "button", "turnIndicator"):
+        region = elements.get(key)
+        if region is not None:
+            regions.append(region)
+    return [region["image"] for region in regions]
+
+
+def _same_frame(
+    last_frame: Tuple[str, Tuple[int, ...], List[np.ndarray], object],
+    layout_json: str,
+    frame_shape: Tuple[int, ...],
+    crops: Sequence[np.ndarray],
+) -> bool:
+    """Whether the previous frame had the same layout and identical ROI pixels.
+
+    Only the ROIs feed the response, so comparing their pixels exactly is
+    both cheaper than hashing the whole frame and free of collisions.
+    """
+
+    last_layout, last_shape, last_crops, _ = last_frame
+    return (
+        last_layout == layout_json
+        and last_shape == frame_shape
+        and len(last_crops) == len(crops)
+        and all(
+            last.shape == crop.shape and np.array_equal(last, crop)
+            for last, crop in zip(last_crops, crops)
+        )
+    )
+
+
+def _proto_button_name(raw_name: str) -> str:
+    return "all_in" if raw_name in {"allIn", "all_in"} else raw_name
+
+
+class RegionMemo:
+    """Last pixels and recognition result per named ROI.
+
+    Idle tables re-render identical pixels for most regions, so a region whose
+    crop is byte-identical to the previous frame reuses its previous result.
+    Safe to share between RPC threads and the inference pool; ``recognize``
+    itself runs outside the lock.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[np.ndarray, object]] = {}
+        self._lock = threading.Lock()
+
+    def recognize(
+        self,
+        names: Sequence[str],
+        images: Sequence[np.ndarray],
+        recognize: Callable[[List[np.ndarray]], List[R]],
+    ) -> List[R]:
+        """Return results for ``images``, calling ``recognize`` once for changed ones."""
+
+        results: List[Optional[R]] = [None] * len(images)
+        misses: List[int] = []
+        with self._lock:
+            entries = [self._entries.get(name) for name in names]
+        for index, (entry, image) in enumerate(zip(entries, images)):
+            if (
+                entry is not None
+                and entry[0].shape == image.shape
+                and np.array_equal(entry[0], image)
+            ):
+                results[index] = entry[1]  # type: ignore[assignment]
+            else:
+                misses.append(index)
+
+        if misses:
+            fresh = recognize([images[index] for index in misses])
+            stored = [
+                (images[index].copy(), result) for index, result in zip(misses, fresh)
+            ]
+            with self._lock:
+                for index, entry in zip(misses, stored):
+                    self._entries[names[index]] = entry
+            for index, (_, result) in zip(misses, stored):
+                results[index] = result
+        return results  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
 class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
     """Serve CaptureFrame/HealthCheck RPCs backed by the local vision pipeline."""
@@ -43,11 +178,42 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
         recognizer: Optional[ElementRecognizer] = None,
         template_manager: Optional[TemplateManager] = None,
         ready: bool = True,
+        inference_workers: int = 0,
     ) -> None:
         self._models = model_manager
         self._capture = capture or ScreenCapture()
         self._recognizer = recognizer or ElementRecognizer(model_manager)
         self._ready = ready
+        # Cards and amounts are memoized by the recognizer's own pixel caches;
+        # the dealer button and occlusion scores have no cache of their own.
+        self._button_memo = RegionMemo()
+        self._occlusion_memo = RegionMemo()
+        # Layout JSON, frame size and ROI crops of the last analyzed frame, and
+        # the response it produced; a static table is answered without
+        # re-running the pipeline.
+        self._last_frame: Optional[
+            Tuple[str, Tuple[int, ...], List[np.ndarray], vision_pb2.VisionOutput]
+        ] = None
+        # Concurrent RPCs read and replace _last_frame; the entry itself is an
+        # immutable tuple, so the lock only covers the swap.
+        self._last_frame_lock = threading.Lock()
+        # Optional pool that runs card recognition alongside the amount models.
+        self._infer_pool: Optional[futures.ThreadPoolExecutor] = (
+            futures.ThreadPoolExecutor(
+                max_workers=inference_workers, thread_name_prefix="vision-infer"
+            )
+            if inference_workers > 0
+            else None
+        )
+        # Output builders are reused per worker thread and reset each frame.
+        self._local = threading.local()
+        # Orchestrators resend the same layout JSON on every frame; keep the
+        # parsed packs of the last few tables so each is decoded once, not per RPC.
+        self._layout_cache: LRUCache[LayoutPack] = LRUCache(LAYOUT_CACHE_SIZE)
+        # ROI slice bounds per cached layout and frame size.
+        self._compiled_layout: LRUCache[Tuple[LayoutPack, LayoutSlices]] = LRUCache(
+            LAYOUT_CACHE_SIZE
+        )
         if template_manager is not None:
             self._template_manager = template_manager
         else:
@@ -64,7 +230,7 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
         self, request: vision_pb2.CaptureRequest, context: grpc.ServicerContext
     ) -> vision_pb2.VisionOutput:
         try:
-            layout = self._parse_layout(request.layout_json)
+            layout = self._layout_for(request.layout_json)
         except (
             ValueError
         ) as exc:  # pragma: no cover - validation handled via gRPC status
@@ -73,30 +239,87 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
             )
 
         try:
-            frame = self._capture.capture_frame()
+            return self._capture_output(request.layout_json, layout)
         except ScreenCaptureError as exc:  # pragma: no cover - device failure path
             LOGGER.error("Screen capture failed: %s", exc)
             context.abort(grpc.StatusCode.UNAVAILABLE, f"Screen capture failed: {exc}")
             raise
 
-        builder = VisionOutputBuilder()
+    def _capture_output(
+        self, layout_json: str, layout: LayoutPack
+    ) -> vision_pb2.VisionOutput:
+        """Capture a frame and analyze it into a response message."""
+
+        frame = self._capture.capture_frame()
+        builder = self._builder()
         builder.mark_capture_complete()
-        elements = extract_all_rois(frame, layout)
-
-        self._process_cards(elements.get("cards", []), builder)
-        self._process_stacks(elements.get("stacks", {}), builder)
-        self._process_pot(elements.get("pot"), builder)
-        self._process_button(elements.get("button"), builder)
-        self._process_turn_indicator(elements.get("turnIndicator"), builder)
-        self._process_action_buttons(
-            elements.get("actionButtons", {}),
-            builder,
-            self._template_manager.templates,
+        elements = extract_all_rois(
+            frame, layout, self._compiled_for(layout, frame.shape[:2])
         )
+        crops = _region_images(elements)
+        with self._last_frame_lock:
+            last_frame = self._last_frame
+        if last_frame is not None and _same_frame(
+            last_frame, layout_json, frame.shape, crops
+        ):
+            builder.mark_extraction_complete()
+            return self._refresh_proto(last_frame[3], builder.build())
+
+        cards = elements.get("cards", [])
+        pending_cards: Optional[futures.Future] = None
+        if self._infer_pool is not None:
+            # Card and digit models are independent sessions; ORT releases the
+            # GIL, so both batches run at once.
+            pending_cards = self._infer_pool.submit(self._process_cards, cards, builder)
+        else:
+            self._process_cards(cards, builder)
+        try:
+            self._process_amounts(
+                elements.get("stacks", {}), elements.get("pot"), builder
+            )
+            self._process_button(elements.get("button"), builder)
+            self._process_turn_indicator(elements.get("turnIndicator"), builder)
+            self._process_action_buttons(
+                elements.get("actionButtons", {}),
+                builder,
+                self._template_manager.templates,
+            )
+        finally:
+            if pending_cards is not None:
+                # Never return while the pool still writes into this thread's
+                # builder; the next request would reset it underneath.
+                futures.wait([pending_cards])
+        if pending_cards is not None:
+            pending_cards.result()
 
         builder.mark_extraction_complete()
-        payload = builder.build()
-        return self._to_proto(payload)
+        vision_output = self._to_proto(builder.build())
+        # Responses are fresh messages nobody mutates after this, so the
+        # cached one is shared rather than copied; only the crops are copied.
+        snapshot = (
+            layout_json,
+            frame.shape,
+            [crop.copy() for crop in crops],
+            vision_output,
+        )
+        with self._last_frame_lock:
+            self._last_frame = snapshot
+        return vision_output
+
+    def _builder(self) -> VisionOutputBuilder:
+        builder = getattr(self._local, "builder", None)
+        if builder is None:
+            builder = self._local.builder = VisionOutputBuilder(reuse_output=True)
+        else:
+            builder.reset()
+        return builder
+
+    def close(self) -> None:
+        """Shut down the inference pool once in-flight card batches finish."""
+
+        if self._infer_pool is not None:
+            self._infer_pool.shutdown(wait=True)
+            self._infer_pool = None
 
     def HealthCheck(
         self, request: vision_pb2.Empty, context: grpc.ServicerContext
@@ -106,16 +329,55 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
             message="ready" if self._ready else "not ready",
         )
 
-    @staticmethod
     def _record_occlusion(
-        builder: VisionOutputBuilder, roi_name: str, region: Mapping[str, object]
-    ) -> None:
-        image = region.get("image")
-        roi = region.get("roi")
-        if image is None or roi is None:
-            return
-        _, occlusion_score = detect_occlusion(image, roi)  # heuristic score in [0, 1]
-        builder.set_occlusion(roi_name, occlusion_score)
+        self,
+        builder: VisionOutputBuilder,
+        roi_names: Sequence[str],
+        regions: Sequence[Mapping[str, object]],
+    ) -> Dict[str, float]:
+        """Score occlusion for a group of ROIs with one batched histogram pass.
+
+        Returns the recorded score per ROI name.
+        """
+
+        named = [
+            (name, region["image"])
+            for name, region in zip(roi_names, regions)
+            if region.get("image") is not None and region.get("roi") is not None
+        ]
+        scores = self._occlusion_memo.recognize(
+            [name for name, _ in named],
+            [image for _, image in named],
+            detect_occlusion_batch,
+        )
+        recorded: Dict[str, float] = {}
+        for (name, _), (_, occlusion_score) in zip(named, scores):
+            builder.set_occlusion(name, occlusion_score)  # heuristic score in [0, 1]
+            recorded[name] = occlusion_score
+        return recorded
+
+    def _recognize_readable(
+        self,
+        names: Sequence[str],
+        regions: Sequence[Mapping[str, object]],
+        scores: Mapping[str, float],
+        recognize: Callable[[List[np.ndarray]], List[R]],
+        unreadable: R,
+    ) -> List[R]:
+        """Recognize ROIs in one batch, skipping ones too flat to read."""
+
+        readable = [
+            index
+            for index, name in enumerate(names)
+            if scores.get(name, 0.0) <= UNREADABLE_OCCLUSION_SCORE
+        ]
+        results = [unreadable] * len(names)
+        if not readable:
+            return results
+        recognized = recognize([regions[index]["image"] for index in readable])
+        for index, result in zip(readable, recognized):
+            results[index] = result
+        return results
 
     def _process_cards(
         self, cards: Sequence[Mapping[str, object]], builder: VisionOutputBuilder
@@ -124,8 +386,12 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
         community_cards: List[Dict[str, str]] = []
         confidences: List[float] = []
 
-        for index, region in enumerate(cards):
-            card_result = self._recognizer.recognize_card(region["image"])
+        names = _card_names(len(cards))
+        scores = self._record_occlusion(builder, names, cards)
+        card_results = self._recognize_readable(
+            names, cards, scores, self._recognizer.recognize_cards, _UNREADABLE_CARD
+        )
+        for index, card_result in enumerate(card_results):
             confidences.append(float(card_result.get("confidence", 0.0)))
             card_entry = {
                 "rank": str(card_result.get("rank", "?")),
@@ -135,40 +401,64 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
                 hole_cards.append(card_entry)
             else:
                 community_cards.append(card_entry)
-            self._record_occlusion(builder, f"card_{index}", region)
 
-        builder.set_cards(
-            hole_cards, community_cards[:5], fmean(confidences) if confidences else 0.0
+        card_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        builder.set_cards(hole_cards, community_cards[:5], card_confidence)
+
+    def _process_amounts(
+        self,
+        stacks: Mapping[str, Mapping[str, object]],
+        pot_region: Optional[Mapping[str, object]],
+        builder: VisionOutputBuilder,
+    ) -> None:
+        """Recognize stacks and pot with a single batched digit-model run."""
+
+        names = list(_stack_names(tuple(stacks)))
+        regions = list(stacks.values())
+        if pot_region is not None:
+            names.append("pot")
+            regions.append(pot_region)
+        scores = self._record_occlusion(builder, names, regions)
+        results = self._recognize_readable(
+            names,
+            regions,
+            scores,
+            self._recognizer.recognize_amounts,
+            _UNREADABLE_AMOUNT,
         )
 
+        self._process_stacks(stacks, builder, results[: len(stacks)])
+        if pot_region is not None:
+            self._process_pot(pot_region, builder, results[len(stacks)])
+
     def _process_stacks(
-        self, stacks: Mapping[str, Mapping[str, object]], builder: VisionOutputBuilder
+        self,
+        stacks: Mapping[str, Mapping[str, object]],
+        builder: VisionOutputBuilder,
+        stack_results: Sequence[Mapping[str, float]],
     ) -> None:
         confidences: List[float] = []
-        for position, region in stacks.items():
-            stack_result = self._recognizer.recognize_stack(region["image"])
+        for position, stack_result in zip(stacks, stack_results):
             builder.set_stack(
                 position,
                 float(stack_result.get("amount", 0.0)),
                 float(stack_result.get("confidence", 0.0)),
             )
             confidences.append(float(stack_result.get("confidence", 0.0)))
-            self._record_occlusion(builder, f"stack_{position}", region)
 
         if confidences:
-            builder.set_positions(fmean(confidences))
+            builder.set_positions(sum(confidences) / len(confidences))
 
     def _process_pot(
-        self, pot_region: Optional[Mapping[str, object]], builder: VisionOutputBuilder
+        self,
+        pot_region: Mapping[str, object],
+        builder: VisionOutputBuilder,
+        pot_result: Mapping[str, float],
     ) -> None:
-        if pot_region is None:
-            return
-        pot_result = self._recognizer.recognize_pot(pot_region["image"])
         builder.set_pot(
             float(pot_result.get("amount", 0.0)),
             float(pot_result.get("confidence", 0.0)),
         )
-        self._record_occlusion(builder, "pot", pot_region)
 
     def _process_button(
         self,
@@ -179,18 +469,22 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
             builder.set_buttons("BTN", 0.0)
             return
 
-        button_result = self._recognizer.detect_dealer_button(button_region["image"])
+        (button_result,) = self._button_memo.recognize(
+            ["dealer_button"],
+            [button_region["image"]],
+            lambda images: [self._recognizer.detect_dealer_button(images[0])],
+        )
         dealer = "BTN" if button_result.get("present") else "SB"
         builder.set_buttons(dealer, float(button_result.get("confidence", 0.0)))
         builder.set_positions(float(button_result.get("confidence", 0.0)))
-        self._record_occlusion(builder, "dealer_button", button_region)
+        self._record_occlusion(builder, ["dealer_button"], [button_region])
 
     def _process_turn_indicator(
         self, turn_region: Optional[Mapping[str, object]], builder: VisionOutputBuilder
     ) -> None:
         if turn_region is None:
             return
-        self._record_occlusion(builder, "turn_indicator", turn_region)
+        self._record_occlusion(builder, ["turn_indicator"], [turn_region])
 
     def _process_action_buttons(
         self,
@@ -203,10 +497,9 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
                 buttons, templates, self._template_manager.threshold
             )
             template_names = self._template_manager.template_names
+            untemplated: List[str] = []
 
-            for raw_name, region in buttons.items():
-                proto_name = "all_in" if raw_name in {"allIn", "all_in"} else raw_name
-
+            for raw_name in buttons:
                 if raw_name in match_results:
                     # Case A: button detected above threshold
                     result = match_results[raw_name]
@@ -217,27 +510,12 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
                         "confidence": result.confidence,
                         "text": raw_name,
                     }
-                    builder.set_action_button(proto_name, button_info)
+                    builder.set_action_button(_proto_button_name(raw_name), button_info)
                 elif raw_name not in template_names:
                     # Case B: no template declared — use occlusion fallback
-                    _, occlusion_score = detect_occlusion(
-                        region["image"], region["roi"]
-                    )
-                    button_info = {
-                        "screen_coords": (
-                            int(round(float(region["roi"]["x"]))),
-                            int(round(float(region["roi"]["y"]))),
-                        ),
-                        "is_enabled": occlusion_score < 0.5,
-                        "is_visible": True,
-                        "confidence": 1.0 - occlusion_score,
-                        "text": raw_name,
-                    }
-                    builder.set_action_button(proto_name, button_info)
-                    builder.set_occlusion(
-                        f"action_button_{proto_name}", occlusion_score
-                    )
+                    untemplated.append(raw_name)
                 # Case C: template exists but below threshold — omit (Req 5.5)
+            self._record_button_occlusion(builder, buttons, untemplated)
 
             # Derive turn state from template matches (Req 5.7)
             is_hero_turn, turn_confidence = derive_turn_state(match_results)
@@ -248,21 +526,54 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
             )
         else:
             # Fallback: no templates loaded — use occlusion heuristics
-            for raw_name, region in buttons.items():
-                proto_name = "all_in" if raw_name in {"allIn", "all_in"} else raw_name
-                _, occlusion_score = detect_occlusion(region["image"], region["roi"])
-                button_info = {
-                    "screen_coords": (
-                        int(round(float(region["roi"]["x"]))),
-                        int(round(float(region["roi"]["y"]))),
-                    ),
-                    "is_enabled": occlusion_score < 0.5,
-                    "is_visible": True,
-                    "confidence": 1.0 - occlusion_score,
-                    "text": raw_name,
-                }
-                builder.set_action_button(proto_name, button_info)
-                builder.set_occlusion(f"action_button_{proto_name}", occlusion_score)
+            self._record_button_occlusion(builder, buttons, list(buttons))
+
+    def _record_button_occlusion(
+        self,
+        builder: VisionOutputBuilder,
+        buttons: Mapping[str, Mapping[str, object]],
+        names: Sequence[str],
+    ) -> None:
+        """Report buttons without a template decision from their occlusion scores."""
+
+        scores = self._occlusion_memo.recognize(
+            [f"action_button_{name}" for name in names],
+            [buttons[name]["image"] for name in names],
+            detect_occlusion_batch,
+        )
+        for raw_name, (_, occlusion_score) in zip(names, scores):
+            roi = buttons[raw_name]["roi"]
+            proto_name = _proto_button_name(raw_name)
+            button_info = {
+                "screen_coords": (
+                    int(round(float(roi["x"]))),
+                    int(round(float(roi["y"]))),
+                ),
+                "is_enabled": occlusion_score < 0.5,
+                "is_visible": True,
+                "confidence": 1.0 - occlusion_score,
+                "text": raw_name,
+            }
+            builder.set_action_button(proto_name, button_info)
+            builder.set_occlusion(f"action_button_{proto_name}", occlusion_score)
+
+    def _layout_for(self, layout_json: str) -> LayoutPack:
+        layout = self._layout_cache.get(layout_json)
+        if layout is None:
+            layout = self._parse_layout(layout_json)
+            self._layout_cache.put(layout_json, layout)
+        return layout
+
+    def _compiled_for(
+        self, layout: LayoutPack, frame_shape: Tuple[int, ...]
+    ) -> LayoutSlices:
+        key = (id(layout), frame_shape)
+        cached = self._compiled_layout.get(key)
+        if cached is not None and cached[0] is layout:
+            return cached[1]
+        compiled = compile_layout(layout, frame_shape)
+        self._compiled_layout.put(key, (layout, compiled))
+        return compiled
 
     @staticmethod
     def _parse_layout(layout_json: str) -> LayoutPack:
@@ -271,115 +582,163 @@ class VisionServicer(vision_pb2_grpc.VisionServiceServicer):
         data = json.loads(layout_json)
         return data
 
+    def _refresh_proto(
+        self, cached: vision_pb2.VisionOutput, payload: Dict[str, object]
+    ) -> vision_pb2.VisionOutput:
+        """Answer an unchanged frame with ``cached`` under this frame's timing."""
+
+        vision_output = vision_pb2.VisionOutput()
+        vision_output.CopyFrom(cached)
+        vision_output.timestamp = int(payload.get("timestamp", 0))
+        latency = payload.get("latency") or {}
+        vision_output.latency.capture = float(latency.get("capture", 0.0))
+        vision_output.latency.extraction = float(latency.get("extraction", 0.0))
+        vision_output.latency.total = float(latency.get("total", 0.0))
+        return vision_output
+
     def _to_proto(self, payload: Dict[str, object]) -> vision_pb2.VisionOutput:
+        """Build a response message from ``payload``, setting fields in place."""
+
+        vision_output = vision_pb2.VisionOutput()
+        vision_output.timestamp = int(payload.get("timestamp", 0))
+
         cards_section = payload.get("cards", {})
-        card_message = vision_pb2.CardData(
-            hole_cards=[
-                vision_pb2.Card(rank=card.get("rank", ""), suit=card.get("suit", ""))
-                for card in cards_section.get("hole_cards", [])
-            ],
-            community_cards=[
-                vision_pb2.Card(rank=card.get("rank", ""), suit=card.get("suit", ""))
-                for card in cards_section.get("community_cards", [])
-            ],
-            confidence=float(cards_section.get("confidence", 0.0)),
-        )
+        card_message = vision_output.cards
+        card_message.SetInParent()
+        for card in cards_section.get("hole_cards", []):
+            card_message.hole_cards.add(
+                rank=card.get("rank", ""), suit=card.get("suit", "")
+            )
+        for card in cards_section.get("community_cards", []):
+            card_message.community_cards.add(
+                rank=card.get("rank", ""), suit=card.get("suit", "")
+            )
+        card_message.confidence = float(cards_section.get("confidence", 0.0))
 
         pot_section = payload.get("pot") or {"amount": 0.0, "confidence": 0.0}
-        pot_message = vision_pb2.AmountData(
-            amount=float(pot_section.get("amount", 0.0)),
-            confidence=float(pot_section.get("confidence", 0.0)),
-        )
+        pot_message = vision_output.pot
+        pot_message.SetInParent()
+        pot_message.amount = float(pot_section.get("amount", 0.0))
+        pot_message.confidence = float(pot_section.get("confidence", 0.0))
 
         buttons_section = payload.get("buttons") or {"dealer": "BTN", "confidence": 0.0}
-        button_message = vision_pb2.ButtonData(
-            dealer=str(buttons_section.get("dealer", "BTN")),
-            confidence=float(buttons_section.get("confidence", 0.0)),
-        )
+        button_message = vision_output.buttons
+        button_message.SetInParent()
+        button_message.dealer = str(buttons_section.get("dealer", "BTN"))
+        button_message.confidence = float(buttons_section.get("confidence", 0.0))
 
         positions_conf = (
             payload.get("positions", {}).get("confidence", 0.0)
             if payload.get("positions")
             else 0.0
         )
-        positions_message = vision_pb2.PositionData(confidence=float(positions_conf))
+        vision_output.positions.SetInParent()
+        vision_output.positions.confidence = float(positions_conf)
 
         latency_section = payload.get("latency") or {
             "capture": 0.0,
             "extraction": 0.0,
             "total": 0.0,
         }
-        latency_message = vision_pb2.LatencyData(
-            capture=float(latency_section.get("capture", 0.0)),
-            extraction=float(latency_section.get("extraction", 0.0)),
-            total=float(latency_section.get("total", 0.0)),
-        )
-
-        vision_output = vision_pb2.VisionOutput(
-            timestamp=int(payload.get("timestamp", 0)),
-            cards=card_message,
-            pot=pot_message,
-            buttons=button_message,
-            positions=positions_message,
-            latency=latency_message,
-        )
-
-        vision_output.stacks.update(
-            {
-                position: vision_pb2.StackData(
-                    amount=float(stack_info.get("amount", 0.0)),
-                    confidence=float(stack_info.get("confidence", 0.0)),
-                )
-                for position, stack_info in (payload.get("stacks") or {}).items()
-            }
-        )
+        latency_message = vision_output.latency
+        latency_message.SetInParent()
+        latency_message.capture = float(latency_section.get("capture", 0.0))
+        latency_message.extraction = float(latency_section.get("extraction", 0.0))
+        latency_message.total = float(latency_section.get("total", 0.0))
+
+        # Message-valued map entries and fields are filled in place; protobuf
+        # rejects assigning message objects to them.
+        for position, stack_info in (payload.get("stacks") or {}).items():
+            stack_message = vision_output.stacks[position]
+            stack_message.amount = float(stack_info.get("amount", 0.0))
+            stack_message.confidence = float(stack_info.get("confidence", 0.0))
 
         vision_output.occlusion.update(payload.get("occlusion") or {})
 
         action_buttons_payload = payload.get("action_buttons") or {}
         if action_buttons_payload:
-            action_buttons_message = vision_pb2.ActionButtons()
+            action_buttons_message = vision_output.action_buttons
+            action_buttons_message.SetInParent()
             for name, metadata in action_buttons_payload.items():
-                button_info = vision_pb2.ButtonInfo(
-                    is_enabled=bool(metadata.get("is_enabled")),
-                    is_visible=bool(metadata.get("is_visible")),
-                    confidence=float(metadata.get("confidence", 0.0)),
-                    text=str(metadata.get("text", "")),
-                )
+                if name not in _ACTION_BUTTON_FIELDS:
+                    LOGGER.debug("Dropping unknown action button %r", name)
+                    continue
+                button_info = getattr(action_buttons_message, name)
+                button_info.is_enabled = bool(metadata.get("is_enabled"))
+                button_info.is_visible = bool(metadata.get("is_visible"))
+                button_info.confidence = float(metadata.get("confidence", 0.0))
+                button_info.text = str(metadata.get("text", ""))
                 coords = metadata.get("screen_coords")
                 if isinstance(coords, tuple) or isinstance(coords, list):
-                    button_info.screen_coords.CopyFrom(
-                        vision_pb2.ScreenCoords(x=int(coords[0]), y=int(coords[1]))
-                    )
-                setattr(action_buttons_message, name, button_info)
-            vision_output.action_buttons.CopyFrom(action_buttons_message)
+                    button_info.screen_coords.x = int(coords[0])
+                    button_info.screen_coords.y = int(coords[1])
+                    button_info.screen_coords.SetInParent()
 
         turn_state_payload = payload.get("turn_state")
         if isinstance(turn_state_payload, Mapping):
-            turn_state_message = vision_pb2.TurnState(
-                is_hero_turn=bool(turn_state_payload.get("is_hero_turn")),
-                action_timer=int(turn_state_payload.get("action_timer", 0)),
-                confidence=float(turn_state_payload.get("confidence", 0.0)),
-            )
-            vision_output.turn_state.CopyFrom(turn_state_message)
+            turn = vision_output.turn_state
+            turn.SetInParent()
+            turn.is_hero_turn = bool(turn_state_payload.get("is_hero_turn"))
+            turn.action_timer = int(turn_state_payload.get("action_timer", 0))
+            turn.confidence = float(turn_state_payload.get("confidence", 0.0))
 
         return vision_output
 
 
-def serve(
-    *,
-    port: int = 50052,
-    model_dir: Optional[str] = None,
-    max_workers: int = 4,
-    layout_pack_dir: Optional[str] = None,
-) -> grpc.Server:
-    """Start the gRPC server and block until it is shut down."""
+class AsyncVisionServicer(vision_pb2_grpc.VisionServiceServicer):
+    """Serve a :class:`VisionServicer` from a ``grpc.aio`` server.
 
-    address = f"[::]:{port}"
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    Layout lookup and message (de)serialization stay on the event loop while
+    capture, extraction and inference run on ``executor``, so RPCs waiting on
+    the network do not hold a pipeline thread.
+    """
+
+    def __init__(
+        self, servicer: VisionServicer, executor: futures.Executor
+    ) -> None:
+        self._servicer = servicer
+        self._executor = executor
 
-    resolved_model_dir = model_dir or os.environ.get("VISION_MODEL_DIR", "models")
-    model_manager = ModelManager(resolved_model_dir)
+    async def CaptureFrame(
+        self, request: vision_pb2.CaptureRequest, context: grpc.aio.ServicerContext
+    ) -> vision_pb2.VisionOutput:
+        try:
+            layout = self._servicer._layout_for(request.layout_json)
+        except ValueError as exc:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, f"Invalid layout JSON: {exc}"
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor,
+                self._servicer._capture_output,
+                request.layout_json,
+                layout,
+            )
+        except ScreenCaptureError as exc:  # pragma: no cover - device failure path
+            LOGGER.error("Screen capture failed: %s", exc)
+            await context.abort(
+                grpc.StatusCode.UNAVAILABLE, f"Screen capture failed: {exc}"
+            )
+            raise
+
+    async def HealthCheck(
+        self, request: vision_pb2.Empty, context: grpc.aio.ServicerContext
+    ) -> vision_pb2.HealthStatus:
+        return self._servicer.HealthCheck(request, context)
+
+
+def _resolve_model_dir(model_dir: Optional[str]) -> str:
+    return model_dir or os.environ.get("VISION_MODEL_DIR", "models")
+
+
+def _build_servicer(
+    model_dir: Optional[str], layout_pack_dir: Optional[str], inference_workers: int
+) -> Tuple[VisionServicer, str]:
+    resolved_model_dir = _resolve_model_dir(model_dir)
+    model_manager = get_model_manager(resolved_model_dir)
     model_manager.preload_models()
 
     ready = True
@@ -396,10 +755,47 @@ def serve(
         model_manager,
         template_manager=template_manager,
         ready=ready,
+        inference_workers=inference_workers,
+    )
+    return servicer, resolved_model_dir
+
+
+def serve(
+    *,
+    port: int = 50052,
+    model_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    layout_pack_dir: Optional[str] = None,
+    inference_workers: int = 0,
+) -> grpc.Server:
+    """Start the gRPC server and block until it is shut down.
+
+    Sessions run single-threaded and are shared by every worker, so
+    concurrency comes from the RPC pool, sized to the CPU count by default.
+    ``inference_workers`` > 0 additionally overlaps card and amount inference
+    within each RPC, which lowers single-table latency on idle cores.
+    """
+
+    address = f"[::]:{port}"
+    workers = max_workers or os.cpu_count() or 4
+    # SO_REUSEPORT lets several serve() processes share the port; see serve_processes.
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=workers),
+        options=[("grpc.so_reuseport", 1)],
+    )
+
+    servicer, resolved_model_dir = _build_servicer(
+        model_dir, layout_pack_dir, inference_workers
     )
     vision_pb2_grpc.add_VisionServiceServicer_to_server(servicer, server)
     server.add_insecure_port(address)
     server.start()
+    threading.Thread(
+        target=_close_when_stopped,
+        args=(server, servicer),
+        name="vision-close",
+        daemon=True,
+    ).start()
 
     LOGGER.info(
         "Vision service listening on %s (models: %s)", address, resolved_model_dir
@@ -407,13 +803,147 @@ def serve(
     return server
 
 
+def _close_when_stopped(server: grpc.Server, servicer: VisionServicer) -> None:
+    server.wait_for_termination()
+    servicer.close()
+
+
+async def serve_aio(
+    *,
+    port: int = 50052,
+    model_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    layout_pack_dir: Optional[str] = None,
+    inference_workers: int = 0,
+) -> grpc.aio.Server:
+    """Start an asyncio gRPC server; await ``wait_for_termination()`` on it.
+
+    Same arguments as :func:`serve`. ``max_workers`` sizes the pipeline
+    executor rather than the RPC pool, since in-flight RPCs no longer each
+    hold a thread.
+    """
+
+    address = f"[::]:{port}"
+    workers = max_workers or os.cpu_count() or 4
+    servicer, resolved_model_dir = _build_servicer(
+        model_dir, layout_pack_dir, inference_workers
+    )
+    executor = futures.ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="vision-rpc"
+    )
+    server = grpc.aio.server(options=[("grpc.so_reuseport", 1)])
+    vision_pb2_grpc.add_VisionServiceServicer_to_server(
+        AsyncVisionServicer(servicer, executor), server
+    )
+    server.add_insecure_port(address)
+    await server.start()
+    task = asyncio.get_running_loop().create_task(
+        _aclose_when_stopped(server, servicer, executor)
+    )
+    _CLOSE_TASKS.add(task)
+    task.add_done_callback(_CLOSE_TASKS.discard)
+
+    LOGGER.info(
+        "Vision service (asyncio) listening on %s (models: %s)",
+        address,
+        resolved_model_dir,
+    )
+    return server
+
+
+# The loop only keeps weak references to tasks.
+_CLOSE_TASKS: Set[asyncio.Task] = set()
+
+
+async def _aclose_when_stopped(
+    server: grpc.aio.Server, servicer: VisionServicer, executor: futures.Executor
+) -> None:
+    await server.wait_for_termination()
+    executor.shutdown(wait=False)
+    servicer.close()
+
+
+async def _serve_aio_forever(**kwargs: object) -> None:
+    server = await serve_aio(**kwargs)  # type: ignore[arg-type]
+    await server.wait_for_termination()
+
+
+def _serve_forever(
+    cpu: Optional[int] = None, use_async: bool = False, **kwargs: object
+) -> None:
+    logging.basicConfig(level=logging.INFO)
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        # Before serve(): threads started later inherit the affinity.
+        os.sched_setaffinity(0, {cpu})
+    if use_async:
+        asyncio.run(_serve_aio_forever(**kwargs))
+    else:
+        serve(**kwargs).wait_for_termination()  # type: ignore[arg-type]
+
+
+def serve_processes(
+    processes: int, *, pin_cpus: bool = False, **kwargs: object
+) -> None:
+    """Run ``processes`` independent servers on one port and wait for them.
+
+    Each process loads its own models and sessions, so the Python parts of
+    ``CaptureFrame`` are not serialized by one interpreter's GIL. The kernel
+    spreads connections across the processes via ``SO_REUSEPORT`` (Linux).
+    Processes are spawned rather than forked because gRPC must not be
+    initialized before a fork. With ``pin_cpus`` each process is bound to one
+    core (Linux), which keeps its caches warm and avoids migration jitter at
+    the cost of no longer absorbing load spikes on idle cores.
+
+    Sessions are created once here first, so the optimized graphs are
+    persisted before the workers start and each worker only loads them.
+    """
+
+    model_dir = kwargs.get("model_dir")
+    if not isinstance(model_dir, str):
+        model_dir = None
+    ModelManager(_resolve_model_dir(model_dir)).load_models()
+
+    context = multiprocessing.get_context("spawn")
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    workers = []
+    for index in range(processes):
+        cpu = cpus[index % len(cpus)] if pin_cpus and cpus else None
+        workers.append(
+            context.Process(
+                target=_serve_forever,
+                kwargs=dict(kwargs, cpu=cpu),
+                name=f"vision-{index}",
+            )
+        )
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     port = int(os.environ.get("VISION_PORT", "50052"))
     model_dir = os.environ.get("VISION_MODEL_PATH") or os.environ.get(
         "VISION_MODEL_DIR"
     )
-    max_workers = int(os.environ.get("VISION_MAX_WORKERS", "4"))
-    serve(
-        port=port, model_dir=model_dir, max_workers=max_workers
-    ).wait_for_termination()
+    max_workers = int(os.environ.get("VISION_MAX_WORKERS", "0")) or None
+    inference_workers = int(os.environ.get("VISION_INFERENCE_WORKERS", "0"))
+    processes = int(os.environ.get("VISION_PROCESSES", "1"))
+    options = dict(
+        port=port,
+        model_dir=model_dir,
+        max_workers=max_workers,
+        inference_workers=inference_workers,
+        use_async=os.environ.get("VISION_ASYNC", "0") not in ("", "0"),
+    )
+    if processes > 1:
+        pin_cpus = os.environ.get("VISION_PIN_CPUS", "0") not in ("", "0")
+        serve_processes(processes, pin_cpus=pin_cpus, **options)
+    else:
+        _serve_forever(**options)
@@ -11,7 +11,7 @@ from typing import Dict, FrozenSet, Mapping, Optional, Tuple
 import cv2
 import numpy as np
 
-from .fallback import _to_grayscale
+from .fallback import to_grayscale
 
 LOGGER = logging.getLogger(__name__)
 
@@ -169,8 +169,8 @@ def match_template_with_location(
     if template.size == 0 or image.size == 0:
         return 0.0, (0, 0)
 
-    image_gray = _to_grayscale(image)
-    template_gray = _to_grayscale(template)
+    image_gray = to_grayscale(image)
+    template_gray = to_grayscale(template)
 
     try:
         result = cv2.matchTemplate(image_gray, template_gray, cv2.TM_CCOEFF_NORMED)
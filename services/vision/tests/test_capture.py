@@ -0,0 +1,93 @@
+"""Tests for the screen capture backends."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from vision.capture import ScreenCapture
+
+
+class _FakeMss:
+    """Stand-in for a persistent ``mss.mss()`` instance."""
+
+    def __init__(self, height: int = 4, width: int = 6) -> None:
+        self.monitors = [{"left": 0, "top": 0, "width": width, "height": height}]
+        self.grab_calls = 0
+        bgra = np.zeros((height, width, 4), dtype=np.uint8)
+        bgra[..., 0] = 10
+        bgra[..., 1] = 20
+        bgra[..., 2] = 30
+        bgra[..., 3] = 255
+        self._raw = bytearray(bgra.tobytes())
+
+    def grab(self, monitor):
+        self.grab_calls += 1
+        return SimpleNamespace(
+            raw=self._raw, height=monitor["height"], width=monitor["width"]
+        )
+
+
+def _mss_capture(fake: _FakeMss) -> ScreenCapture:
+    capture = ScreenCapture()
+    capture._grabber = fake
+    capture._backend_name = "mss"
+    capture._monitor = fake.monitors[0]
+    return capture
+
+
+def test_mss_capture_reuses_grabber_and_drops_alpha() -> None:
+    fake = _FakeMss()
+    capture = _mss_capture(fake)
+
+    first = capture.capture_frame()
+    second = capture.capture_frame()
+
+    assert fake.grab_calls == 2
+    assert first.shape == (4, 6, 3)
+    assert first.dtype == np.uint8
+    assert tuple(first[0, 0]) == (10, 20, 30)
+    assert np.array_equal(first, second)
+
+
+def test_pil_capture_returns_bgr_and_drops_alpha_without_convert() -> None:
+    from PIL import Image
+
+    rgba = np.zeros((3, 5, 4), dtype=np.uint8)
+    rgba[..., 0] = 200
+    rgba[..., 3] = 128
+    image = Image.fromarray(rgba, mode="RGBA")
+
+    capture = ScreenCapture()
+    capture._grabber = SimpleNamespace(grab=lambda: image)
+    capture._backend_name = "PIL.ImageGrab"
+
+    frame = capture.capture_frame()
+
+    assert frame.shape == (3, 5, 3)
+    assert tuple(frame[0, 0]) == (0, 0, 200)
+
+
+def test_fallback_frame_is_allocated_once() -> None:
+    capture = ScreenCapture(fallback_resolution=(4, 6))
+    capture._grabber = None
+
+    first = capture.capture_frame()
+
+    assert first.shape == (4, 6, 3) and not first.any()
+    assert capture.capture_frame() is first
+    assert not first.flags.writeable
+
+
+def test_close_releases_mss_grabber() -> None:
+    fake = _FakeMss()
+    fake.closed = False
+    fake.close = lambda: setattr(fake, "closed", True)
+    capture = _mss_capture(fake)
+
+    capture.close()
+
+    assert fake.closed
+    assert capture.capture_frame().shape[2] == 3
+    assert fake.grab_calls == 0
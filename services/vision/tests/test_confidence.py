@@ -0,0 +1,32 @@
+"""Tests for confidence scoring helpers."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from vision.confidence import aggregate_confidence, calculate_match_confidence
+
+
+def test_aggregate_confidence_is_geometric_mean() -> None:
+    values = [0.9, 0.8, 0.5]
+    expected = math.exp(sum(math.log(v) for v in values) / len(values))
+
+    assert aggregate_confidence(values) == pytest.approx(expected)
+
+
+def test_aggregate_confidence_skips_missing_and_clamps() -> None:
+    assert aggregate_confidence([None, float("nan"), 2.0]) == pytest.approx(1.0)
+    assert aggregate_confidence([0.0]) == pytest.approx(1e-6)
+
+
+def test_aggregate_confidence_empty() -> None:
+    assert aggregate_confidence([]) == 0.0
+    assert aggregate_confidence(iter([None])) == 0.0
+
+
+def test_calculate_match_confidence_returns_max_probability() -> None:
+    assert calculate_match_confidence(np.array([0.1, 0.7, 0.2])) == pytest.approx(0.7)
+    assert calculate_match_confidence(np.array([])) == 0.0
@@ -0,0 +1,149 @@
+"""Tests for ROI extraction helpers."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+from vision.extraction import (
+    ElementRecognizer,
+    _resolve_roi,
+    _resolve_rois,
+    extract_all_rois,
+    extract_roi,
+)
+from vision.models import ModelManager
+
+
+def test_extract_roi_returns_view_unless_copy_requested() -> None:
+    frame = np.arange(10 * 12 * 3, dtype=np.uint8).reshape(10, 12, 3)
+    roi = {"x": 2, "y": 3, "width": 4, "height": 5}
+
+    view = extract_roi(frame, roi)
+    owned = extract_roi(frame, roi, copy=True)
+
+    assert view.shape == (5, 4, 3)
+    assert np.shares_memory(view, frame)
+    assert not np.shares_memory(owned, frame)
+    assert np.array_equal(view, owned)
+
+
+def test_extract_all_rois_regions_alias_frame() -> None:
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+    layout = {"potROI": {"x": 0.25, "y": 0.25, "width": 0.5, "height": 0.5, "relative": True}}
+
+    elements = extract_all_rois(frame, layout)
+
+    assert elements["pot"]["image"].shape == (10, 10, 3)
+    assert np.shares_memory(elements["pot"]["image"], frame)
+
+
+def _recognizer(cache_size: int = 16):
+    manager = MagicMock(spec=ModelManager)
+    manager.predict_cards.side_effect = lambda images: [("A", 0.95, "s", 0.9)] * len(images)
+    manager.predict_digits_batch.side_effect = lambda images: [("125", 0.9)] * len(images)
+    return ElementRecognizer(manager, use_fallback=False, cache_size=cache_size), manager
+
+
+def test_recognize_cards_reuses_results_for_unchanged_rois() -> None:
+    recognizer, manager = _recognizer()
+    rng = np.random.default_rng(0)
+    first = rng.integers(0, 256, (40, 30, 3), dtype=np.uint8)
+    second = rng.integers(0, 256, (40, 30, 3), dtype=np.uint8)
+
+    recognizer.recognize_cards([first])
+    results = recognizer.recognize_cards([first.copy(), second])
+
+    assert [result["rank"] for result in results] == ["A", "A"]
+    assert manager.predict_cards.call_count == 2
+    assert len(manager.predict_cards.call_args.args[0]) == 1
+
+
+def test_similar_amount_rois_do_not_share_a_result() -> None:
+    recognizer, manager = _recognizer()
+    manager.predict_digits_batch.side_effect = [[("0", 0.9)], [("1", 0.9)]]
+
+    def render(text: str) -> np.ndarray:
+        image = np.zeros((40, 220, 3), dtype=np.uint8)
+        cv2.putText(image, text, (8, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+        return image
+
+    # "$0" and "$1" share a 16x16 difference hash at this size.
+    first = recognizer.recognize_amounts([render("$0")])
+    second = recognizer.recognize_amounts([render("$1")])
+
+    assert first[0]["amount"] == 0.0
+    assert second[0]["amount"] == 1.0
+    assert manager.predict_digits_batch.call_count == 2
+
+
+def test_amount_cache_can_be_disabled() -> None:
+    recognizer, manager = _recognizer(cache_size=0)
+    image = np.full((12, 40, 3), 200, dtype=np.uint8)
+
+    recognizer.recognize_amounts([image])
+    recognizer.recognize_amounts([image])
+
+    assert manager.predict_digits_batch.call_count == 2
+
+
+def test_vectorized_roi_resolution_matches_scalar_resolution() -> None:
+    frame = np.zeros((90, 160, 3), dtype=np.uint8)
+    rng = np.random.default_rng(7)
+    rois = [
+        {"x": float(x), "y": float(y), "width": float(w), "height": float(h)}
+        for x, y, w, h in rng.uniform(-20, 200, (50, 4))
+    ]
+    rois += [
+        {"x": x, "y": y, "width": w, "height": h, "relative": True}
+        for x, y, w, h in rng.uniform(-0.2, 1.2, (50, 4)).tolist()
+    ]
+    rois.append({"x": 2.5, "y": 3.5, "width": 0.5, "height": 160})
+
+    rects = _resolve_rois(frame.shape, rois)
+
+    assert [tuple(rect) for rect in rects.tolist()] == [_resolve_roi(frame, roi) for roi in rois]
+
+
+def test_extract_all_rois_groups_regions_by_section() -> None:
+    frame = np.zeros((50, 50, 3), dtype=np.uint8)
+    roi = {"x": 1, "y": 1, "width": 5, "height": 5}
+    layout = {
+        "cardROIs": [roi, roi],
+        "stackROIs": {"BTN": roi},
+        "buttonROI": roi,
+        "actionButtonROIs": {"fold": roi},
+    }
+
+    elements = extract_all_rois(frame, layout)
+
+    assert len(elements["cards"]) == 2
+    assert list(elements["stacks"]) == ["BTN"]
+    assert list(elements["actionButtons"]) == ["fold"]
+    assert elements["button"]["image"].shape == (5, 5, 3)
+    assert "pot" not in elements and "turnIndicator" not in elements
+
+
+def test_gray_scratch_buffer_is_reused_per_roi_size() -> None:
+    recognizer, _ = _recognizer()
+    rng = np.random.default_rng(5)
+    first = rng.integers(0, 256, (16, 24, 3), dtype=np.uint8)
+    second = rng.integers(0, 256, (16, 24, 3), dtype=np.uint8)
+
+    gray_first = recognizer._gray(first)
+    gray_second = recognizer._gray(second)
+
+    assert gray_second is gray_first
+    assert np.array_equal(gray_second, cv2.cvtColor(second, cv2.COLOR_BGR2GRAY))
+    assert recognizer._gray(rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)) is not gray_first
+
+
+def test_recognized_amounts_drop_separators_and_whitespace() -> None:
+    recognizer, manager = _recognizer(cache_size=0)
+    manager.predict_digits_batch.side_effect = lambda images: [(" 1,250 000\n", 0.9)] * len(images)
+
+    result = recognizer.recognize_amounts([np.zeros((10, 30, 3), dtype=np.uint8)])
+
+    assert result == [{"amount": 1250000.0, "confidence": 0.9}]
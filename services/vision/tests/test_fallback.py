@@ -0,0 +1,144 @@
+"""Tests for template-matching fallbacks."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from vision import fallback
+from vision.fallback import TemplateBank, match_template, prepare_templates, recognize_card_template
+
+
+def test_recognize_card_template_picks_best_prepared_template() -> None:
+    rng = np.random.default_rng(3)
+    ace = rng.integers(0, 256, (20, 14, 3), dtype=np.uint8)
+    king = rng.integers(0, 256, (20, 14, 3), dtype=np.uint8)
+    oversized = rng.integers(0, 256, (60, 60, 3), dtype=np.uint8)
+    roi = cv2.copyMakeBorder(ace, 4, 4, 4, 4, cv2.BORDER_CONSTANT, value=(0, 0, 0))
+
+    templates = prepare_templates({"As": ace, "Kd": king, "Qh": oversized})
+
+    assert all(template.ndim == 2 for template in templates.values())
+    rank, suit, confidence = recognize_card_template(roi, templates)
+    assert (rank, suit) == ("A", "S")
+    assert confidence > 0.99
+
+
+def test_recognize_card_template_without_templates() -> None:
+    roi = np.zeros((10, 10, 3), dtype=np.uint8)
+
+    assert recognize_card_template(roi, {}) == ("?", "?", 0.0)
+
+
+def test_recognize_card_template_stops_at_early_exit_confidence(monkeypatch) -> None:
+    scores = iter([0.5, 0.97, 0.99])
+    calls = []
+
+    def fake_match(image, template):
+        calls.append(template)
+        return next(scores)
+
+    monkeypatch.setattr(fallback, "match_template", fake_match)
+    tile = np.zeros((4, 4), dtype=np.uint8)
+    templates = {"2h": tile, "Kd": tile, "As": tile}
+
+    rank, suit, confidence = recognize_card_template(np.zeros((8, 8), dtype=np.uint8), templates)
+
+    assert (rank, suit, confidence) == ("K", "D", 0.97)
+    assert len(calls) == 2
+
+
+def test_template_bank_scores_match_cv2_per_template(monkeypatch) -> None:
+    rng = np.random.default_rng(7)
+    templates = {f"{rank}s": rng.integers(0, 256, (18, 12), dtype=np.uint8) for rank in "23456789TJQKA"}
+    templates["Xh"] = rng.integers(0, 256, (10, 9), dtype=np.uint8)
+    templates["Fh"] = np.full((18, 12), 90, dtype=np.uint8)
+    roi = rng.integers(0, 256, (26, 20), dtype=np.uint8)
+    roi[5:23, 3:15] = templates["Ts"]
+    bank = TemplateBank(templates)
+
+    expected = max(templates, key=lambda key: match_template(roi, templates[key]))
+    key, confidence = bank.best_match(roi)
+    assert key == expected == "Ts"
+    assert abs(confidence - match_template(roi, templates["Ts"])) < 1e-4
+    assert recognize_card_template(roi, bank)[:2] == ("T", "S")
+
+    # Oversized searches go through cv2.matchTemplate and agree with the batch.
+    monkeypatch.setattr(fallback, "MAX_BATCHED_MATCH_ELEMENTS", 0)
+    assert bank.best_match(roi)[0] == "Ts"
+
+
+def test_template_bank_ranks_large_groups_on_coarse_level() -> None:
+    rng = np.random.default_rng(11)
+    templates = {
+        f"{rank}h": cv2.GaussianBlur(rng.integers(0, 256, (32, 24), dtype=np.uint8), (5, 5), 1.5)
+        for rank in "23456789TJQKA"
+    }
+    roi = rng.integers(0, 256, (40, 30), dtype=np.uint8)
+    roi[6:38, 2:26] = templates["Qh"]
+    bank = TemplateBank(templates)
+
+    key, confidence = bank.best_match(roi)
+
+    assert key == "Qh"
+    assert abs(confidence - match_template(roi, templates["Qh"])) < 1e-4
+
+
+def test_template_bank_skips_scoring_flat_roi(monkeypatch) -> None:
+    rng = np.random.default_rng(5)
+    bank = TemplateBank({"As": rng.integers(0, 256, (8, 6), dtype=np.uint8)})
+    monkeypatch.setattr(fallback, "_score_windows", lambda *args: pytest.fail("flat ROI was scored"))
+
+    assert bank.best_match(np.full((12, 10), 200, dtype=np.uint8)) == (None, 0.0)
+
+
+def test_recognize_digits_ocr_reuses_persistent_engine(monkeypatch) -> None:
+    class FakeApi:
+        def __init__(self) -> None:
+            self.images = []
+
+        def SetImage(self, image) -> None:
+            self.images.append(image)
+
+        def GetUTF8Text(self) -> str:
+            return " 1O5.5\n"
+
+    api = FakeApi()
+    monkeypatch.setattr(fallback, "_tesserocr_api", lambda: api)
+    roi = np.zeros((10, 30), dtype=np.uint8)
+
+    assert fallback.recognize_digits_ocr(roi)[0] == "105.5"
+    assert fallback.recognize_digits_ocr(roi)[0] == "105.5"
+    assert len(api.images) == 2
+
+
+def test_recognize_digits_ocr_without_backends(monkeypatch) -> None:
+    monkeypatch.setattr(fallback, "_tesserocr_api", lambda: None)
+    monkeypatch.setattr(fallback, "_load_pytesseract", lambda: None)
+
+    assert fallback.recognize_digits_ocr(np.zeros((10, 30), dtype=np.uint8)) == ("", 0.0)
+
+
+def test_recognize_digits_cnn_batches_glyphs_left_to_right() -> None:
+    roi = np.zeros((20, 40, 3), dtype=np.uint8)
+    roi[4:16, 24:30] = 255  # right glyph, 6 px wide
+    roi[4:16, 4:8] = 255  # left glyph, 4 px wide
+    roi[14:16, 16:18] = 255  # decimal point
+    roi[0, 39] = 255  # single-pixel noise
+
+    class FakeManager:
+        def __init__(self) -> None:
+            self.batches = []
+
+        def predict_digits_batch(self, images):
+            self.batches.append(images)
+            labels = {4: "1", 2: "."}
+            return [(labels.get(int(np.count_nonzero(image[:, :, 0].max(axis=0))), "8"), 0.9) for image in images]
+
+    manager = FakeManager()
+    glyphs = fallback.segment_digit_glyphs(roi)
+
+    assert [glyph.shape[0] == glyph.shape[1] for glyph in glyphs] == [True, True, True]
+    assert fallback.recognize_digits_cnn(roi, manager) == ("1.8", pytest.approx(0.9))
+    assert len(manager.batches) == 1
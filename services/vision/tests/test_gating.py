@@ -0,0 +1,15 @@
+"""Tests for confidence gating helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from vision.gating import compute_overall_confidence
+
+
+def test_compute_overall_confidence_weights_and_clamps() -> None:
+    elements = {"cards": 1.5, "stacks": float("nan"), "pot": -0.2, "unknown": 0.4}
+
+    expected = (1.0 * 0.5 + 0.4 * 0.05) / (0.5 + 0.3 + 0.2 + 0.05)
+    assert compute_overall_confidence(elements) == pytest.approx(expected)
+    assert compute_overall_confidence({}) == 0.0
@@ -0,0 +1,276 @@
+"""Tests for ONNX model resolution and inference helpers."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from vision import models
+from vision.models import ModelManager, get_model_manager
+
+
+def test_model_paths_prefer_int8_variant(tmp_path) -> None:
+    (tmp_path / "card_rank.onnx").write_bytes(b"")
+    (tmp_path / "card_rank_int8.onnx").write_bytes(b"")
+    (tmp_path / "card_suit.onnx").write_bytes(b"")
+
+    manager = ModelManager(str(tmp_path))
+
+    assert manager._model_paths("card_rank") == [
+        str(tmp_path / "card_rank_int8.onnx"),
+        str(tmp_path / "card_rank.onnx"),
+    ]
+    assert manager._model_paths("card_suit") == [str(tmp_path / "card_suit.onnx")]
+    assert manager._model_paths("digit") == []
+
+
+class _FakeBinding:
+    """Minimal IOBinding stand-in that records the bound input."""
+
+    def __init__(self, session: "_FakeSession") -> None:
+        self._session = session
+        self.inputs = {}
+        self.outputs = None
+
+    def bind_cpu_input(self, name, array) -> None:
+        self.inputs[name] = array
+
+    def bind_output(self, name) -> None:
+        pass
+
+    def copy_outputs_to_cpu(self):
+        return self.outputs
+
+
+class _FakeSession:
+    """Minimal InferenceSession stand-in returning fixed per-row outputs."""
+
+    def __init__(self, rows: np.ndarray, batch_dim: object = "batch") -> None:
+        self._rows = rows
+        self._batch_dim = batch_dim
+        self.run_calls = 0
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input", shape=[self._batch_dim, 3, 64, 64])]
+
+    def get_outputs(self):
+        return [SimpleNamespace(name="output")]
+
+    def io_binding(self) -> _FakeBinding:
+        return _FakeBinding(self)
+
+    def run_with_iobinding(self, binding: _FakeBinding) -> None:
+        binding.outputs = self.run(None, binding.inputs)
+
+    def run(self, output_names, feeds):
+        self.run_calls += 1
+        batch = feeds["input"]
+        assert batch.shape[1:] == (3, 64, 64)
+        return [np.stack([self._rows[i % len(self._rows)] for i in range(len(batch))])]
+
+
+def _manager_with_sessions(tmp_path, **sessions) -> ModelManager:
+    manager = ModelManager(str(tmp_path))
+    manager._sessions.update(sessions)
+    return manager
+
+
+def test_predict_cards_runs_each_model_once(tmp_path) -> None:
+    rank_rows = np.eye(13, dtype=np.float32)[[12, 0]]
+    suit_rows = np.eye(4, dtype=np.float32)[[3, 1]]
+    rank_session = _FakeSession(rank_rows)
+    suit_session = _FakeSession(suit_rows)
+    manager = _manager_with_sessions(tmp_path, card_rank=rank_session, card_suit=suit_session)
+    images = [np.zeros((40, 30, 3), dtype=np.uint8), np.zeros((20, 10, 3), dtype=np.uint8)]
+
+    results = manager.predict_cards(images)
+
+    assert results == [("A", 1.0, "s", 1.0), ("2", 1.0, "d", 1.0)]
+    assert rank_session.run_calls == 1
+    assert suit_session.run_calls == 1
+
+
+def test_predict_cards_falls_back_to_single_runs_for_fixed_batch(tmp_path) -> None:
+    rank_session = _FakeSession(np.eye(13, dtype=np.float32)[[5]], batch_dim=1)
+    suit_session = _FakeSession(np.eye(4, dtype=np.float32)[[0]], batch_dim=1)
+    manager = _manager_with_sessions(tmp_path, card_rank=rank_session, card_suit=suit_session)
+    images = [np.zeros((40, 30, 3), dtype=np.uint8)] * 3
+
+    results = manager.predict_cards(images)
+
+    assert results == [("7", 1.0, "h", 1.0)] * 3
+    assert rank_session.run_calls == 3
+
+
+def test_preprocess_writes_scaled_chw_into_buffer(tmp_path) -> None:
+    manager = ModelManager(str(tmp_path))
+    image = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    buffer = np.empty((1, 3, 64, 64), dtype=np.float32)
+
+    tensor = manager._preprocess(image, buffer)
+
+    assert tensor is buffer
+    expected = (image.astype(np.float32) / 255.0).transpose(2, 0, 1)
+    np.testing.assert_allclose(tensor[0], expected, rtol=1e-6)
+
+
+def test_predict_digits_batch_decodes_each_row(tmp_path) -> None:
+    digit_rows = np.eye(11, dtype=np.float32)[[3, 10]]
+    digit_session = _FakeSession(digit_rows)
+    manager = _manager_with_sessions(tmp_path, digit=digit_session)
+    images = [np.zeros((12, 30, 3), dtype=np.uint8), np.zeros((12, 18, 3), dtype=np.uint8)]
+
+    results = manager.predict_digits_batch(images)
+
+    assert results == [("3", 1.0), (".", 1.0)]
+    assert digit_session.run_calls == 1
+
+
+def test_decode_digits_drops_unlabelled_time_steps() -> None:
+    probs = np.full((4, 12), 0.01, dtype=np.float32)
+    probs[0, 1] = 0.9
+    probs[1, 11] = 0.95
+    probs[2, 10] = 0.8
+    probs[3, 5] = 0.9
+
+    text, confidence = ModelManager._decode_digits(probs[np.newaxis])
+
+    assert text == "1.5"
+    assert confidence == pytest.approx((0.9 * 0.8 * 0.9) ** (1 / 3), rel=1e-6)
+    assert ModelManager._decode_digits(np.eye(12, dtype=np.float32)[[11, 11]]) == ("", 0.0)
+
+
+def test_top_label_reads_confidence_at_the_argmax() -> None:
+    probs = np.array([0.1, 0.7, 0.2], dtype=np.float32)
+
+    assert ModelManager._top_label(probs, ["a", "b", "c"]) == ("b", pytest.approx(0.7))
+    assert ModelManager._top_label(probs, ["a"]) == ("?", pytest.approx(0.7))
+    assert ModelManager._top_label(probs * 2, ["a", "b", "c"]) == ("b", 1.0)
+
+
+def test_predict_card_shares_one_preprocessed_input(tmp_path, monkeypatch) -> None:
+    rank_session = _FakeSession(np.eye(13, dtype=np.float32)[[8]])
+    suit_session = _FakeSession(np.eye(4, dtype=np.float32)[[2]])
+    manager = _manager_with_sessions(tmp_path, card_rank=rank_session, card_suit=suit_session)
+    preprocess_calls = []
+    original = manager._preprocess
+    monkeypatch.setattr(
+        manager, "_preprocess", lambda image, out=None: preprocess_calls.append(1) or original(image, out)
+    )
+
+    assert manager.predict_card(np.zeros((40, 30, 3), dtype=np.uint8)) == ("T", 1.0, "c", 1.0)
+    assert len(preprocess_calls) == 1
+
+
+def test_preload_models_warms_each_batch_size(tmp_path) -> None:
+    dynamic = _FakeSession(np.eye(11, dtype=np.float32)[[3]])
+    fixed = _FakeSession(np.eye(13, dtype=np.float32)[[5]], batch_dim=1)
+    manager = _manager_with_sessions(tmp_path, digit=dynamic, card_rank=fixed)
+
+    manager.preload_models(batch_sizes=(1, 4, 4))
+
+    assert dynamic.run_calls == 2 * models.WARMUP_RUNS
+    assert fixed.run_calls == models.WARMUP_RUNS
+
+
+def test_session_options_default_to_single_intra_op_thread(monkeypatch) -> None:
+    ort = pytest.importorskip("onnxruntime")
+    monkeypatch.delenv("VISION_ORT_INTRA_OP_THREADS", raising=False)
+    options = ModelManager._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+    assert options.intra_op_num_threads == 1
+    assert options.inter_op_num_threads == 1
+
+    assert options.enable_cpu_mem_arena
+
+    monkeypatch.setenv("VISION_ORT_INTRA_OP_THREADS", "3")
+    monkeypatch.setenv("VISION_ORT_CPU_ARENA", "0")
+    options = ModelManager._session_options(ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+    assert options.intra_op_num_threads == 3
+    assert not options.enable_cpu_mem_arena
+
+
+def test_get_model_manager_shares_one_instance_per_directory(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "other").mkdir()
+
+    shared = get_model_manager(str(tmp_path))
+    assert get_model_manager(".") is shared
+    assert get_model_manager(str(tmp_path / "other")) is not shared
+
+
+def test_concurrent_lazy_loads_create_one_session(tmp_path, monkeypatch) -> None:
+    pytest.importorskip("onnxruntime")
+    (tmp_path / "digit.onnx").write_bytes(b"")
+    manager = ModelManager(str(tmp_path))
+    created = []
+
+    def create_session(path):
+        created.append(path)
+        time.sleep(0.05)
+        return _FakeSession(np.eye(11, dtype=np.float32)[[3]])
+
+    monkeypatch.setattr(manager, "_create_session", create_session)
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(manager._get_session("digit"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(session is sessions[0] for session in sessions)
+
+
+def test_session_metadata_is_read_once(tmp_path) -> None:
+    session = _FakeSession(np.eye(11, dtype=np.float32)[[3]])
+    calls = []
+    get_inputs = session.get_inputs
+    session.get_inputs = lambda: calls.append(1) or get_inputs()
+    manager = _manager_with_sessions(tmp_path, digit=session)
+
+    for _ in range(3):
+        assert manager.predict_digits(np.zeros((10, 30, 3), dtype=np.uint8)) == ("3", 1.0)
+    assert len(calls) == 1
+
+
+def test_execution_providers_prefer_available_accelerators_with_cpu_fallback(monkeypatch) -> None:
+    ort = pytest.importorskip("onnxruntime")
+    available = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    monkeypatch.setattr(ort, "get_available_providers", lambda: available)
+
+    monkeypatch.delenv("VISION_ORT_PROVIDERS", raising=False)
+    assert models._execution_providers() == ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    monkeypatch.setattr(ort, "get_available_providers", lambda: ["CPUExecutionProvider"])
+    assert models._execution_providers() == ["CPUExecutionProvider"]
+    monkeypatch.setattr(ort, "get_available_providers", lambda: available)
+
+    monkeypatch.setenv("VISION_ORT_PROVIDERS", "CPUExecutionProvider")
+    assert models._execution_providers() == ["CPUExecutionProvider"]
+
+    monkeypatch.setenv("VISION_ORT_PROVIDERS", "TensorrtExecutionProvider,CUDAExecutionProvider")
+    assert models._execution_providers() == ["CUDAExecutionProvider", "CPUExecutionProvider"]
+
+
+def test_optimized_graph_is_written_to_a_temp_file_then_renamed(tmp_path, monkeypatch) -> None:
+    ort = pytest.importorskip("onnxruntime")
+    source = tmp_path / "digit.onnx"
+    source.write_bytes(b"")
+    written = []
+
+    def fake_session(path, sess_options, providers):
+        written.append(sess_options.optimized_model_filepath)
+        with open(sess_options.optimized_model_filepath, "wb") as handle:
+            handle.write(b"optimized")
+        return _FakeSession(np.eye(11, dtype=np.float32)[[3]])
+
+    monkeypatch.setattr(models, "_execution_providers", lambda: [models.CPU_PROVIDER])
+    monkeypatch.setattr(ort, "InferenceSession", fake_session)
+    ModelManager(str(tmp_path))._create_session(str(source))
+
+    assert written[0] != str(tmp_path / "digit.opt.onnx")
+    assert (tmp_path / "digit.opt.onnx").read_bytes() == b"optimized"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["digit.onnx", "digit.opt.onnx"]
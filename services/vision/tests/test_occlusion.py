@@ -0,0 +1,101 @@
+"""Tests for occlusion heuristics."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from vision import occlusion
+from vision.occlusion import (
+    analyze_roi_variance,
+    detect_occlusion,
+    detect_occlusion_batch,
+    detect_popup_overlay,
+)
+
+
+def test_detect_occlusion_builds_one_histogram(monkeypatch) -> None:
+    rng = np.random.default_rng(2)
+    image = rng.integers(0, 256, (12, 20, 3), dtype=np.uint8)
+    calls = []
+    original = occlusion._histogram
+    monkeypatch.setattr(occlusion, "_histogram", lambda img: calls.append(1) or original(img))
+
+    is_occluded, score = detect_occlusion(image, {})
+
+    assert len(calls) == 1
+    assert score == 0.0
+    assert is_occluded is False
+
+
+def test_shared_histogram_matches_standalone_helpers() -> None:
+    image = np.full((8, 8, 3), 250, dtype=np.uint8)
+    image[0, 0] = (0, 0, 0)
+    histogram = occlusion._histogram(image)
+
+    assert analyze_roi_variance(image, histogram) == analyze_roi_variance(image)
+    assert detect_popup_overlay(image, histogram) is detect_popup_overlay(image) is True
+    assert detect_occlusion(image, {})[0] is True
+
+
+def test_histogram_statistics_match_channel_mean() -> None:
+    rng = np.random.default_rng(4)
+    for shape in ((9, 13), (9, 13, 3), (9, 13, 4)):
+        image = rng.integers(0, 256, shape, dtype=np.uint8)
+        image[0, :4] = 0
+        image[1, :4] = 255
+        gray = np.mean(image, axis=2) if image.ndim == 3 else image
+        histogram = occlusion._histogram(image)
+
+        assert histogram.std() == pytest.approx(np.std(gray), rel=1e-9)
+        assert histogram.fraction_above(240) == np.mean(gray > 240)
+        assert histogram.fraction_below(15) == np.mean(gray < 15)
+
+
+def test_analyze_roi_variance_matches_numpy_std() -> None:
+    rng = np.random.default_rng(6)
+    image = rng.integers(0, 256, (15, 40, 3), dtype=np.uint8)
+
+    assert analyze_roi_variance(image) == pytest.approx(np.std(np.mean(image, axis=2)), rel=1e-9)
+    assert analyze_roi_variance(image[:, :, 1]) == pytest.approx(np.std(image[:, :, 1]), rel=1e-9)
+    assert analyze_roi_variance(image.astype(np.float32)) == pytest.approx(np.std(np.mean(image, axis=2)), rel=1e-6)
+
+
+def test_detect_occlusion_samples_large_rois(monkeypatch) -> None:
+    rng = np.random.default_rng(8)
+    image = rng.integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    sampled = []
+    original = occlusion._histogram
+    monkeypatch.setattr(occlusion, "_histogram", lambda img: sampled.append(img.shape) or original(img))
+
+    assert detect_occlusion(image, {}) == (False, 0.0)
+    assert sampled[0][0] * sampled[0][1] <= occlusion.MAX_OCCLUSION_SAMPLES
+
+    flat = np.full((300, 400, 3), 128, dtype=np.uint8)
+    assert detect_occlusion(flat, {}) == (True, 1.0)
+
+
+def test_detect_popup_overlay_flags_translucent_bgra() -> None:
+    image = np.full((6, 6, 4), 120, dtype=np.uint8)
+    image[:, :, 3] = 150
+
+    assert detect_popup_overlay(image) is True
+    image[:, :, 3] = 160
+    assert detect_popup_overlay(image) is False
+
+
+def test_detect_occlusion_batch_matches_per_roi_calls() -> None:
+    rng = np.random.default_rng(10)
+    images = [rng.integers(0, 256, (24, 36, 3), dtype=np.uint8) for _ in range(4)]
+    images[1][:] = 128
+    images[2][:20] = 250
+    images += [
+        rng.integers(0, 256, (150, 120, 3), dtype=np.uint8),
+        rng.integers(0, 256, (10, 16), dtype=np.uint8),
+        np.full((6, 6, 4), 120, dtype=np.uint8),
+        rng.random((8, 8, 3)) * 255.0,
+        np.zeros((0, 5, 3), dtype=np.uint8),
+    ]
+
+    assert detect_occlusion_batch(images) == [detect_occlusion(image, {}) for image in images]
+    assert detect_occlusion_batch([]) == []
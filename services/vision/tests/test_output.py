@@ -33,3 +33,62 @@ def test_builder_produces_snake_case_payload() -> None:
     assert payload["cards"]["hole_cards"][0]["rank"] == "A"
     assert payload["action_buttons"]["fold"]["screen_coords"] == (100, 200)
     assert payload["turn_state"]["is_hero_turn"] is True
+
+
+def test_reset_clears_previous_frame() -> None:
+    builder = VisionOutputBuilder(reuse_output=True)
+    builder.set_stack("BTN", 100.0, 0.9)
+    builder.set_occlusion("pot", 0.4)
+    builder.set_action_button("fold", {"is_enabled": True})
+    builder.set_turn_state(is_hero_turn=True, action_timer=5, confidence=0.5)
+    builder.mark_capture_complete()
+    builder.set_positions(0.8)
+    builder.mark_extraction_complete()
+    first = builder.build()
+
+    builder.reset()
+    payload = builder.build()
+
+    assert payload is first
+
+    assert payload["stacks"] == {}
+    assert payload["occlusion"] == {}
+    assert "action_buttons" not in payload
+    assert "turn_state" not in payload
+    assert payload["pot"] == {"amount": 0.0, "confidence": 0.0}
+    assert payload["positions"] == {"confidence": 0.0}
+
+
+def test_payload_from_earlier_frame_survives_reset() -> None:
+    builder = VisionOutputBuilder()
+    builder.set_stack("BTN", 100.0, 0.9)
+    builder.set_occlusion("pot", 0.4)
+    builder.set_action_button("fold", {"is_enabled": True})
+    builder.mark_capture_complete()
+    builder.mark_extraction_complete()
+    first = builder.build()
+    latency = dict(first["latency"])
+
+    builder.reset()
+    builder.set_stack("SB", 50.0, 0.8)
+    builder.mark_capture_complete()
+    second = builder.build()
+
+    assert second is not first
+    assert first["stacks"] == {"BTN": {"amount": 100.0, "confidence": 0.9}}
+    assert first["occlusion"] == {"pot": 0.4}
+    assert first["action_buttons"] == {"fold": {"is_enabled": True}}
+    assert first["latency"] == latency
+    assert list(second["stacks"]) == ["SB"]
+
+
+def test_default_sections_are_not_shared_between_builders() -> None:
+    first = VisionOutputBuilder().build()
+    first["pot"]["amount"] = 999.0
+    first["cards"]["hole_cards"].append({"rank": "A", "suit": "s"})
+
+    payload = VisionOutputBuilder().build()
+
+    assert payload["pot"]["amount"] == 0.0
+    assert payload["cards"]["hole_cards"] == []
+    assert payload["cards"]["community_cards"] == []
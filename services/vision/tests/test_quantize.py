@@ -0,0 +1,68 @@
+"""Tests for offline model quantization."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from vision.models import ModelManager
+from vision.quantize import quantize_models
+
+onnx = pytest.importorskip("onnx")
+
+
+def _write_classifier(path, classes: int) -> None:
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+    weights = rng.standard_normal((4, 3, 3, 3)).astype(np.float32)
+    dense = rng.standard_normal((4, classes)).astype(np.float32)
+    nodes = [
+        helper.make_node("Conv", ["input", "w"], ["conv"], pads=[1, 1, 1, 1]),
+        helper.make_node("GlobalAveragePool", ["conv"], ["pool"]),
+        helper.make_node("Flatten", ["pool"], ["flat"]),
+        helper.make_node("MatMul", ["flat", "d"], ["logits"]),
+        helper.make_node("Softmax", ["logits"], ["output"], axis=1),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "classifier",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", 3, 64, 64])],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, ["batch", classes])],
+        [numpy_helper.from_array(weights, "w"), numpy_helper.from_array(dense, "d")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+
+
+def test_quantized_models_are_written_and_preferred(tmp_path) -> None:
+    _write_classifier(tmp_path / "card_rank.onnx", 13)
+
+    written = quantize_models(str(tmp_path), names=["card_rank"])
+
+    assert written == [str(tmp_path / "card_rank_int8.onnx")]
+    manager = ModelManager(str(tmp_path))
+    assert manager._model_paths("card_rank")[0] == written[0]
+    rank, confidence = manager.predict_card_rank(np.zeros((40, 30, 3), dtype=np.uint8))
+    assert rank != "?" and 0.0 < confidence <= 1.0
+    assert quantize_models(str(tmp_path), names=["card_rank"]) == []
+
+
+def test_calibrated_models_are_quantized_statically(tmp_path) -> None:
+    import cv2
+
+    _write_classifier(tmp_path / "card_suit.onnx", 4)
+    crops = tmp_path / "crops"
+    crops.mkdir()
+    rng = np.random.default_rng(1)
+    for index in range(4):
+        cv2.imwrite(str(crops / f"{index}.png"), rng.integers(0, 256, (40, 30, 3), dtype=np.uint8))
+    (crops / "notes.txt").write_text("ignored")
+
+    written = quantize_models(str(tmp_path), names=["card_suit"], calibration_dir=str(crops))
+
+    ops = {node.op_type for node in onnx.load(written[0]).graph.node}
+    assert "QuantizeLinear" in ops and "DequantizeLinear" in ops
+    suit, confidence = ModelManager(str(tmp_path)).predict_card_suit(np.zeros((40, 30, 3), dtype=np.uint8))
+    assert suit != "?" and 0.0 < confidence <= 1.0
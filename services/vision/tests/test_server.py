@@ -0,0 +1,377 @@
+"""Tests for VisionServicer frame processing helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent import futures
+from unittest.mock import MagicMock
+
+import grpc
+
+import numpy as np
+import pytest
+
+from vision import server, vision_pb2, vision_pb2_grpc
+from vision.models import ModelManager
+from vision.output import VisionOutputBuilder
+from vision.server import AsyncVisionServicer, RegionMemo, VisionServicer
+from vision.templates import TemplateManager
+
+
+def _make_servicer(**kwargs) -> VisionServicer:
+    return VisionServicer(
+        MagicMock(spec=ModelManager),
+        capture=MagicMock(),
+        **kwargs,
+        template_manager=TemplateManager(layout_pack_file=None),
+    )
+
+
+def test_layout_json_is_parsed_once_per_distinct_payload() -> None:
+    servicer = _make_servicer()
+    layout_json = '{"rois": {"pot": {"x": 0, "y": 0, "width": 4, "height": 4}}}'
+
+    first = servicer._layout_for(layout_json)
+    second = servicer._layout_for(layout_json)
+    changed = servicer._layout_for('{"rois": {}}')
+
+    assert second is first
+    assert changed is not first
+    assert changed == {"rois": {}}
+    # Alternating tables keep hitting their own cached packs.
+    assert servicer._layout_for(layout_json) is first
+
+
+def test_layout_slices_are_recompiled_only_on_layout_or_size_change() -> None:
+    servicer = _make_servicer()
+    layout = servicer._layout_for(
+        '{"potROI": {"x": 0.5, "y": 0.5, "width": 0.25, "height": 0.25, "relative": true}}'
+    )
+
+    first = servicer._compiled_for(layout, (100, 200))
+    again = servicer._compiled_for(layout, (100, 200))
+    resized = servicer._compiled_for(layout, (50, 100))
+
+    assert again is first
+    assert first[0][3:] == (50, 75, 100, 150)
+    assert resized[0][3:] == (25, 37, 50, 75)
+
+
+def test_region_memo_only_recognizes_changed_regions() -> None:
+    memo = RegionMemo()
+    calls = []
+
+    def recognize(images):
+        calls.append(len(images))
+        return [int(image[0, 0, 0]) for image in images]
+
+    pot = np.full((4, 6, 3), 7, dtype=np.uint8)
+    stack = np.full((4, 6, 3), 9, dtype=np.uint8)
+
+    assert memo.recognize(["pot", "stack_BTN"], [pot, stack], recognize) == [7, 9]
+    stack[:] = 3
+    assert memo.recognize(["pot", "stack_BTN"], [pot, stack], recognize) == [7, 3]
+    assert memo.recognize(["pot", "stack_BTN"], [pot, stack], recognize) == [7, 3]
+    assert calls == [2, 1]
+
+
+def test_dealer_button_is_recognized_only_when_pixels_change() -> None:
+    recognizer = MagicMock()
+    recognizer.detect_dealer_button.return_value = {"present": True, "confidence": 0.9}
+    servicer = VisionServicer(
+        MagicMock(spec=ModelManager),
+        capture=MagicMock(),
+        recognizer=recognizer,
+        template_manager=TemplateManager(layout_pack_file=None),
+    )
+    image = np.full((8, 8, 3), 200, dtype=np.uint8)
+    region = {"image": image, "roi": {}}
+
+    for _ in range(2):
+        builder = VisionOutputBuilder()
+        servicer._process_button(region, builder)
+    image[0, 0] = 0
+    servicer._process_button(region, builder)
+
+    assert recognizer.detect_dealer_button.call_count == 2
+    assert builder.build()["buttons"] == {"dealer": "BTN", "confidence": 0.9}
+
+
+def test_card_recognition_runs_on_inference_pool_when_enabled() -> None:
+    threads = []
+    recognizer = MagicMock()
+    recognizer.recognize_cards.side_effect = lambda images: threads.append(
+        threading.current_thread().name
+    ) or [{"rank": "A", "suit": "S", "confidence": 0.9} for _ in images]
+    recognizer.recognize_amounts.side_effect = lambda images: [
+        {"amount": 5.0, "confidence": 0.8} for _ in images
+    ]
+    recognizer.detect_dealer_button.return_value = {"present": False, "confidence": 0.5}
+    capture = MagicMock()
+    capture.capture_frame.return_value = np.random.default_rng(3).integers(
+        0, 256, (40, 60, 3), dtype=np.uint8
+    )
+    servicer = VisionServicer(
+        MagicMock(spec=ModelManager),
+        capture=capture,
+        recognizer=recognizer,
+        template_manager=TemplateManager(layout_pack_file=None),
+        inference_workers=1,
+    )
+    roi = {"x": 0, "y": 0, "width": 10, "height": 10}
+    request = vision_pb2.CaptureRequest(
+        layout_json=json.dumps({"cardROIs": [roi, roi], "potROI": roi})
+    )
+
+    output = servicer.CaptureFrame(request, MagicMock())
+
+    assert threads and threads[0].startswith("vision-infer")
+    assert [card.rank for card in output.cards.hole_cards] == ["A", "A"]
+    assert output.pot.amount == 5.0
+
+
+def test_occlusion_is_rescored_only_for_changed_regions(monkeypatch) -> None:
+    batches = []
+    original = server.detect_occlusion_batch
+    monkeypatch.setattr(
+        server,
+        "detect_occlusion_batch",
+        lambda images: batches.append(len(images)) or original(images),
+    )
+    servicer = _make_servicer()
+    pot = {"image": np.full((6, 8, 3), 128, dtype=np.uint8), "roi": {}}
+    stack = {"image": np.full((6, 8, 3), 30, dtype=np.uint8), "roi": {}}
+
+    for _ in range(2):
+        builder = VisionOutputBuilder()
+        servicer._record_occlusion(builder, ["pot", "stack_BTN"], [pot, stack])
+    stack["image"][0, 0] = 255
+    servicer._record_occlusion(builder, ["pot", "stack_BTN"], [pot, stack])
+
+    assert batches == [2, 1]
+    assert builder.build()["occlusion"]["pot"] == 1.0
+
+
+def test_flat_regions_skip_model_inference() -> None:
+    recognizer = MagicMock()
+    recognizer.recognize_cards.side_effect = lambda images: [
+        {"rank": "K", "suit": "h", "confidence": 0.9} for _ in images
+    ]
+    recognizer.recognize_amounts.side_effect = lambda images: [
+        {"amount": 4.0, "confidence": 0.8} for _ in images
+    ]
+    servicer = _make_servicer(recognizer=recognizer)
+    rng = np.random.default_rng(7)
+    textured = {"image": rng.integers(0, 256, (10, 8, 3), dtype=np.uint8), "roi": {}}
+    flat = {"image": np.full((10, 8, 3), 40, dtype=np.uint8), "roi": {}}
+    builder = VisionOutputBuilder()
+
+    servicer._process_cards([textured, flat], builder)
+    servicer._process_amounts({"BTN": flat}, textured, builder)
+    payload = builder.build()
+
+    assert [len(call.args[0]) for call in recognizer.recognize_cards.call_args_list] == [1]
+    assert payload["cards"]["hole_cards"] == [
+        {"rank": "K", "suit": "h"},
+        {"rank": "?", "suit": "?"},
+    ]
+    assert payload["stacks"]["BTN"] == {"amount": 0.0, "confidence": 0.0}
+    assert payload["pot"]["amount"] == 4.0
+    assert payload["occlusion"]["card_1"] == 1.0
+
+
+def test_to_proto_fills_stacks_and_buttons() -> None:
+    servicer = _make_servicer()
+    builder = VisionOutputBuilder()
+    builder.set_stack("BTN", 12.5, 0.9)
+    builder.set_action_button(
+        "fold",
+        {
+            "screen_coords": (3, 4),
+            "is_enabled": True,
+            "is_visible": True,
+            "confidence": 0.7,
+            "text": "fold",
+        },
+    )
+    builder.set_action_button("unknown", {"is_enabled": True})
+    builder.set_turn_state(is_hero_turn=True, action_timer=3, confidence=0.6)
+
+    first = servicer._to_proto(builder.build())
+
+    assert first.stacks["BTN"].amount == 12.5
+    assert first.action_buttons.fold.screen_coords.y == 4
+    assert first.action_buttons.fold.confidence == pytest.approx(0.7)
+    assert first.turn_state.action_timer == 3
+
+    builder.reset()
+    second = servicer._to_proto(builder.build())
+
+    assert second is not first
+    assert first.stacks["BTN"].amount == 12.5
+    assert not second.stacks and not second.HasField("action_buttons")
+    assert second.HasField("cards") and second.HasField("latency")
+
+
+def test_unchanged_frame_reuses_previous_response() -> None:
+    frame = np.random.default_rng(5).integers(0, 256, (40, 60, 3), dtype=np.uint8)
+    capture = MagicMock()
+    capture.capture_frame.return_value = frame
+    recognizer = MagicMock()
+    recognizer.recognize_amounts.return_value = [{"amount": 7.0, "confidence": 0.8}]
+    servicer = VisionServicer(
+        MagicMock(spec=ModelManager),
+        capture=capture,
+        recognizer=recognizer,
+        template_manager=TemplateManager(layout_pack_file=None),
+    )
+    runs = []
+    to_proto = servicer._to_proto
+    servicer._to_proto = lambda payload: runs.append(1) or to_proto(payload)
+    request = vision_pb2.CaptureRequest(
+        layout_json=json.dumps({"potROI": {"x": 0, "y": 0, "width": 10, "height": 10}})
+    )
+
+    first = servicer.CaptureFrame(request, MagicMock())
+    second = servicer.CaptureFrame(request, MagicMock())
+
+    assert len(runs) == 1
+    assert second is not first
+    assert second.pot.amount == first.pot.amount == 7.0
+
+    # Pixels outside every ROI do not affect the response.
+    frame[30, 50] = 255 - frame[30, 50]
+    servicer.CaptureFrame(request, MagicMock())
+    assert len(runs) == 1
+
+    frame[9, 9] = 255 - frame[9, 9]
+    servicer.CaptureFrame(request, MagicMock())
+    assert len(runs) == 2
+
+
+def test_async_server_answers_capture_frame_from_executor() -> None:
+    recognizer = MagicMock()
+    recognizer.recognize_amounts.side_effect = lambda images: [
+        {"amount": 9.0, "confidence": 0.8} for _ in images
+    ]
+    capture = MagicMock()
+    capture.capture_frame.return_value = np.random.default_rng(9).integers(
+        0, 256, (40, 60, 3), dtype=np.uint8
+    )
+    servicer = _make_servicer(recognizer=recognizer)
+    servicer._capture = capture
+    request = vision_pb2.CaptureRequest(
+        layout_json=json.dumps({"potROI": {"x": 0, "y": 0, "width": 10, "height": 10}})
+    )
+
+    async def call() -> tuple:
+        executor = futures.ThreadPoolExecutor(max_workers=1)
+        aio_server = grpc.aio.server()
+        vision_pb2_grpc.add_VisionServiceServicer_to_server(
+            AsyncVisionServicer(servicer, executor), aio_server
+        )
+        port = aio_server.add_insecure_port("127.0.0.1:0")
+        await aio_server.start()
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                stub = vision_pb2_grpc.VisionServiceStub(channel)
+                output = await stub.CaptureFrame(request)
+                with pytest.raises(grpc.aio.AioRpcError) as error:
+                    await stub.CaptureFrame(vision_pb2.CaptureRequest(layout_json="{"))
+                return output, error.value.code()
+        finally:
+            await aio_server.stop(None)
+            executor.shutdown()
+
+    output, code = asyncio.run(call())
+
+    assert output.pot.amount == 9.0
+    assert code == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_card_batch_is_joined_when_amounts_fail(monkeypatch) -> None:
+    finished = []
+
+    def recognize_cards(images):
+        time.sleep(0.05)
+        finished.append(True)
+        return [{"rank": "A", "suit": "S", "confidence": 0.9} for _ in images]
+
+    recognizer = MagicMock()
+    recognizer.recognize_cards.side_effect = recognize_cards
+    capture = MagicMock()
+    capture.capture_frame.return_value = np.random.default_rng(11).integers(
+        0, 256, (40, 60, 3), dtype=np.uint8
+    )
+    servicer = VisionServicer(
+        MagicMock(spec=ModelManager),
+        capture=capture,
+        recognizer=recognizer,
+        template_manager=TemplateManager(layout_pack_file=None),
+        inference_workers=1,
+    )
+    monkeypatch.setattr(
+        servicer, "_process_amounts", MagicMock(side_effect=RuntimeError("boom"))
+    )
+    roi = {"x": 0, "y": 0, "width": 10, "height": 10}
+    request = vision_pb2.CaptureRequest(layout_json=json.dumps({"cardROIs": [roi]}))
+
+    with pytest.raises(RuntimeError):
+        servicer.CaptureFrame(request, MagicMock())
+
+    assert finished == [True]
+    servicer.close()
+    assert servicer._infer_pool is None
+
+
+def test_servers_close_the_servicer_when_stopped(monkeypatch) -> None:
+    servicer = MagicMock(spec=VisionServicer)
+    monkeypatch.setattr(server, "_build_servicer", lambda *args: (servicer, "models"))
+
+    sync_server = server.serve(port=0)
+    sync_server.stop(None).wait()
+    deadline = time.monotonic() + 5
+    while not servicer.close.called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert servicer.close.call_count == 1
+
+    async def run_aio() -> None:
+        aio_server = await server.serve_aio(port=0)
+        await aio_server.stop(None)
+        for _ in range(100):
+            if servicer.close.call_count == 2:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run_aio())
+    assert servicer.close.call_count == 2
+
+
+def test_serve_processes_loads_models_before_spawning(monkeypatch) -> None:
+    events = []
+
+    class FakeProcess:
+        def __init__(self, **kwargs) -> None:
+            pass
+
+        def start(self) -> None:
+            events.append("start")
+
+        def join(self) -> None:
+            pass
+
+        def is_alive(self) -> bool:
+            return False
+
+    monkeypatch.setattr(ModelManager, "load_models", lambda self: events.append("load"))
+    monkeypatch.setattr(
+        server.multiprocessing,
+        "get_context",
+        lambda method: MagicMock(Process=FakeProcess),
+    )
+    server.serve_processes(2, model_dir="models")
+
+    assert events == ["load", "start", "start"]